@@ -1,14 +1,28 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-import json
 import os
-import shutil
+import threading
+import time
+from contextlib import contextmanager
 
 from components.semester_frame import SemesterFrame
 from components.course_list import CourseList
 from components.drag_drop_manager import DragDropManager
-from models.course import Course
+from models.plan import Plan, course_identifier, default_semester_titles
+from models.history import PlanHistory
+from models.solver import PlanSolver
+from models.requirements import default_rules
 from components.graduation_requirements import GraduationRequirementsFrame
+from components.plan_compare_view import PlanCompareWindow
+from data.search_index import CourseSearchIndex
+from data.catalog_cache import load_course_catalog
+from data.autosave import AutoSaver, atomic_write_json
+from data.journal import Journal, apply_plan_events, apply_ui_events
+from data.plan_store import PlanStore
+from data.slot_index import SlotIndex, slot_metadata
+from data.slot_cache import CachedSlot, SlotCache
+from utils.constants import (AUTO_PLAN_COUNT, AUTO_PLAN_POLL_MS, AUTO_PLAN_TIME_BUDGET, AUTOSAVE_DELAY_MS, JOURNAL_COMPACT_EVENTS,
+                             JOURNAL_MODE, RENDER_BACKEND, SLOT_CACHE_SIZE)
 
 class CalendarApp:
     def __init__(self, root):
@@ -19,27 +33,73 @@ class CalendarApp:
         # Create resources directory if it doesn't exist
         self.resources_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resources')
         self.save_dir = os.path.join(self.resources_dir, 'saves')
+        self.cache_dir = os.path.join(self.resources_dir, 'cache')
         os.makedirs(self.save_dir, exist_ok=True)
         
+        # Favorites, expanded groups and window size are shared by all slots
+        self.ui_state_file = os.path.join(self.resources_dir, 'ui_state.json')
+        self.ui_state_loaded = False
+        self.plan_store = PlanStore(self.save_dir, self.ui_state_file)
+        
         # Initialize slot system
         self.current_slot = "Default"
         self.state_file = os.path.join(self.save_dir, f"{self.current_slot}.json")
-        
-        # Get available save slots - do this BEFORE creating widgets
-        self.available_slots = self.get_available_slots()
+        self.slot_base = None  # Base plan the current slot is stored against
+        self.slot_parent = None  # Slot the current slot was copied from
+        # Recently left slots, kept parsed so switching back is instant
+        self.slot_cache = SlotCache(SLOT_CACHE_SIZE)
+        self.auto_plan_thread = None  # Worker thread of a running auto-plan
+        
+        # In journal mode every change is appended to a journal file, and
+        # the slot / UI state files are only rewritten when it is compacted.
+        # Existing journals are replayed on load in either mode.
+        self.journal_mode = JOURNAL_MODE
+        self.plan_journal = Journal(self.plan_store.journal_file(self.current_slot))
+        self.ui_journal = Journal(os.path.join(self.resources_dir, 'ui_state.journal'))
+        self._restoring = False  # Plan changes are restored from files, not made by the user
+        
+        # Changes are saved shortly after they happen, on a background thread
+        self.autosave = AutoSaver(self.root, self.build_state_snapshot,
+                                  on_status=self.update_title,
+                                  on_error=self.on_save_error,
+                                  delay_ms=AUTOSAVE_DELAY_MS)
         
         # Initialize drag-drop manager
         self.drag_drop_manager = DragDropManager(self)
         
         # Initialize courses
         self.courses = []
+        self.search_index = None
         self.semester_frames = []  # Keep track of all semester frames
         self.load_courses()
         
+        # Courses by the identifier they are saved under (the last course
+        # wins if identifiers repeat)
+        self.course_by_code = {course_identifier(course): course for course in self.courses}
+        
+        # Get available save slots from the slot index - do this BEFORE creating widgets
+        self.slot_index = SlotIndex(self.plan_store, self.course_by_code, self.requirement_rules)
+        self._slot_labels = {}  # Slot picker entry -> slot name
+        self.available_slots = self.get_available_slots()
+        
+        # Pending UI refreshes - collected while the plan changes and flushed
+        # once per event-loop tick, or once at the end of a batch_updates() block
+        self._batch_depth = 0
+        self._refresh_job = None
+        self._pending_courses = set()  # Courses to restyle in the course list
+        self._pending_widgets = set()  # Widgets whose refresh_layout() is due
+        self._requirements_dirty = False
+        
+        # The plan owns the semester assignments; widgets follow its changes
+        self.plan = Plan(default_semester_titles(), rules=self.requirement_rules)
+        self.plan.subscribe(self.on_plan_changed)
+        self.history = PlanHistory(self.plan)
+        
         # Create UI with save slots
         self.create_widgets()
         
-        # Load saved state if it exists
+        # Load the shared UI state and the saved plan if they exist
+        self.load_ui_state()
         self.load_state()
         
         # Bind save state to window close event
@@ -52,9 +112,20 @@ class CalendarApp:
         # Add menus to the menu bar
         file_menu = tk.Menu(menu_bar, tearoff=0)
         file_menu.add_command(label="Save", command=self.save_state)
+        file_menu.add_command(label="Compare Slots...", command=self.compare_slots)
+        file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.on_close)
         menu_bar.add_cascade(label="File", menu=file_menu)
+        edit_menu = tk.Menu(menu_bar, tearoff=0)
+        edit_menu.add_command(label="Undo", accelerator="Ctrl+Z", command=self.undo)
+        edit_menu.add_command(label="Redo", accelerator="Ctrl+Y", command=self.redo)
+        edit_menu.add_separator()
+        edit_menu.add_command(label="Auto-plan", command=self.auto_plan)
+        menu_bar.add_cascade(label="Edit", menu=edit_menu)
         self.root.config(menu=menu_bar)
+        self.root.bind("<Control-z>", lambda e: self.on_history_key(e, self.undo))
+        self.root.bind("<Control-y>", lambda e: self.on_history_key(e, self.redo))
+        self.root.bind("<Control-Shift-Z>", lambda e: self.on_history_key(e, self.redo))
         
         # Add status/save bar at the TOP instead of the bottom
         status_frame = ttk.Frame(self.root)
@@ -70,8 +141,10 @@ class CalendarApp:
         self.slot_combo = ttk.Combobox(
             left_section, 
             textvariable=self.slot_var,
-            values=self.available_slots,
-            width=15
+            values=self.slot_picker_labels(),
+            width=40,
+            # Refresh the summaries whenever the dropdown opens
+            postcommand=self.update_slot_selector
         )
         self.slot_combo.pack(side=tk.LEFT, padx=5)
         self.slot_combo.bind("<<ComboboxSelected>>", self.on_slot_selected)
@@ -104,7 +177,9 @@ class CalendarApp:
         left_panel = ttk.Frame(main_container)
         
         # Create course list
-        self.course_list = CourseList(left_panel, self.courses, self.drag_drop_manager)
+        self.course_list = CourseList(left_panel, self.courses, self.drag_drop_manager,
+                                      search_index=self.search_index,
+                                      render_backend=RENDER_BACKEND)
         self.course_list.pack(fill=tk.BOTH, expand=True)
         
         # Create right panel for semesters and requirements as a vertical PanedWindow
@@ -122,8 +197,12 @@ class CalendarApp:
         self.semester_canvas = tk.Canvas(semester_scroll_frame)
         h_scrollbar = ttk.Scrollbar(semester_scroll_frame, orient="horizontal", command=self.semester_canvas.xview)
         
-        # Configure the canvas
-        self.semester_canvas.configure(xscrollcommand=h_scrollbar.set)
+        # Configure the canvas - scrolling moves the semester frames on
+        # screen, so the drag manager has to re-measure its drop targets
+        def _on_semester_xview(first, last):
+            h_scrollbar.set(first, last)
+            self.drag_drop_manager.invalidate_target_geometry()
+        self.semester_canvas.configure(xscrollcommand=_on_semester_xview)
         self.semester_canvas.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
         h_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
         
@@ -180,45 +259,54 @@ class CalendarApp:
         return "break"  # Prevent propagation to parent widget
     
     def get_available_slots(self):
-        """Get a list of available save slots"""
-        slots = ["Default"]  # Always include Default
-        
-        try:
-            # Get all JSON files in the saves directory
-            if os.path.exists(self.save_dir):
-                for filename in os.listdir(self.save_dir):
-                    if filename.endswith(".json"):
-                        slot_name = filename[:-5]  # Remove .json extension
-                        if slot_name != "Default":  # Already included
-                            slots.append(slot_name)
-        except Exception as e:
-            print(f"Error getting save slots: {e}")
-            
+        """Get a list of available save slots from the slot index"""
+        slots = self.slot_index.names()
+        if "Default" not in slots:  # Always include Default
+            slots.append("Default")
         return sorted(slots)
     
+    def slot_picker_labels(self):
+        """Slot picker entries with a summary of each plan"""
+        # Read the slots missing from the index in one go, writing it once
+        self.slot_index.fill()
+        self._slot_labels = {}
+        labels = []
+        for slot in self.available_slots:
+            summary = self.slot_index.summary(slot)
+            label = f"{slot}  ({summary})" if summary else slot
+            self._slot_labels[label] = slot
+            labels.append(label)
+        return labels
+    
     def update_slot_selector(self):
         """Update the save slot dropdown with current available slots"""
         self.available_slots = self.get_available_slots()
-        self.slot_selector['values'] = self.available_slots
+        self.slot_combo['values'] = self.slot_picker_labels()
     
     def on_slot_selected(self, event):
         """Handle selection of a different save slot"""
-        selected_slot = self.slot_var.get()
+        # The dropdown entries carry a summary - show the plain slot name
+        selected_slot = self._slot_labels.get(self.slot_var.get(), self.slot_var.get())
+        self.slot_var.set(selected_slot)
         
         if selected_slot != self.current_slot:
-            # Ask for confirmation if there are unsaved changes
             if messagebox.askyesno("Switch Save Slot", 
-                                "Are you sure you want to switch to another save slot?\n"
-                                "Any unsaved changes will be lost."):
-                # Save current state to new slot
-                self.current_slot = selected_slot
-                self.state_file = os.path.join(self.save_dir, f"{self.current_slot}.json")
-                
-                # Clear current semester layouts
-                self.clear_semesters()
+                                "Are you sure you want to switch to another save slot?"):
+                # Changes not autosaved yet still go to the old slot
+                self.save_pending_changes()
+                self.remember_current_slot()
                 
-                # Load the new state
-                self.load_state()
+                # Move only the courses that differ between the two plans,
+                # redrawing once
+                start = time.perf_counter()
+                with self.batch_updates():
+                    loaded = self.load_state(selected_slot)
+                if loaded:
+                    print(f"Switched to slot '{selected_slot}' in {(time.perf_counter() - start) * 1000:.1f} ms")
+                else:
+                    # Still on the previous slot - it is not left, so it is not cached
+                    self.slot_cache.discard(self.current_slot)
+                    self.slot_var.set(self.current_slot)
             else:
                 # Revert combobox to previous value
                 self.slot_var.set(self.current_slot)
@@ -241,11 +329,15 @@ class CalendarApp:
             return
             
         # Create a new slot file
-        self.current_slot = slot_name
-        self.state_file = os.path.join(self.save_dir, f"{self.current_slot}.json")
+        self.save_pending_changes()
+        self.remember_current_slot()
+        self.set_current_slot(slot_name)
+        self.slot_base = None
+        self.slot_parent = None
         
-        # Clear current semesters
+        # Clear current semesters - the new slot starts without history
         self.clear_semesters()
+        self.history.clear()
         
         # Save current state to new slot
         self.save_state()
@@ -278,9 +370,16 @@ class CalendarApp:
             messagebox.showerror("Error", f"Save slot '{new_name}' already exists!")
             return
             
+        # Finish all writes to the old file before it is renamed, folding
+        # its journal into it
+        self.compact_journals()
+        self.autosave.flush()
+        
         old_file = self.state_file
-        self.current_slot = new_name
-        self.state_file = os.path.join(self.save_dir, f"{self.current_slot}.json")
+        old_slot = self.current_slot
+        self.set_current_slot(new_name)
+        self.slot_index.rename(old_slot, new_name)
+        self.slot_index.save()
         
         # If the old file exists, rename it
         if os.path.exists(old_file):
@@ -310,22 +409,32 @@ class CalendarApp:
                              f"Are you sure you want to delete the save slot '{self.current_slot}'?\n"
                              "This action cannot be undone."):
             
+            # Drop unsaved changes and let running writes finish, so that
+            # they cannot recreate the file after it was deleted
+            self.autosave.mark_clean()
+            self.autosave.flush()
+            self.plan_journal.reset()
+            
             # Delete the file
             try:
                 if os.path.exists(self.state_file):
                     os.remove(self.state_file)
             except Exception as e:
                 print(f"Error deleting save file: {e}")
+            self.slot_index.remove(self.current_slot)
+            self.slot_index.save()
+            self.slot_cache.discard(self.current_slot)
             
-            # Switch to Default slot
-            self.current_slot = "Default"
-            self.state_file = os.path.join(self.save_dir, f"{self.current_slot}.json")
-            
-            # Clear current semesters
-            self.clear_semesters()
+            # Drop the base plans only the deleted slot was stored against
+            used_bases = self.slot_index.used_bases()
+            if used_bases is not None:
+                self.plan_store.collect_bases(used_bases)
+            else:
+                print("Keeping all base plans - some save slots could not be read")
             
-            # Load the default state
-            self.load_state()
+            # Switch to Default slot, loading its state in place of the deleted plan
+            with self.batch_updates():
+                self.load_state("Default")
             
             # Update UI
             self.update_slot_selector()
@@ -345,23 +454,22 @@ class CalendarApp:
             new_name = f"{base_name}_{counter}"
             counter += 1
         
-        # Save current state
-        self.save_state()
-        
-        # Create copy with new name
-        old_file = self.state_file
-        
-        if os.path.exists(old_file):
-            new_file = os.path.join(self.save_dir, f"{new_name}.json")
-            try:
-                shutil.copy2(old_file, new_file)
-            except Exception as e:
-                print(f"Error duplicating save file: {e}")
-                return
+        # Freeze the current plan; the original and the copy are both stored
+        # as their differences to it
+        try:
+            base = self.plan_store.freeze_base(self.plan.to_assignments())
+        except Exception as e:
+            print(f"Error duplicating save file: {e}")
+            return
+        self.slot_base = base
+        self.save_state(wait=True)
+        self.remember_current_slot()
         
         # Switch to the new slot
-        self.current_slot = new_name
-        self.state_file = os.path.join(self.save_dir, f"{self.current_slot}.json")
+        parent = self.current_slot
+        self.set_current_slot(new_name)
+        self.slot_parent = parent
+        self.save_state(wait=True)
         
         # Update UI
         self.update_slot_selector()
@@ -371,141 +479,497 @@ class CalendarApp:
     
     def clear_semesters(self):
         """Clear all courses from semesters"""
-        for semester_frame in self.semester_frames:
-            # Create a copy of the list to avoid modification during iteration
-            courses_copy = semester_frame.courses.copy()
-            for course in courses_copy:
-                semester_frame.remove_course(course)
+        with self.batch_updates(), self.restoring():
+            self.plan.clear()
+    
+    @contextmanager
+    def restoring(self):
+        """Plan changes inside the block are not journaled (loading or clearing a slot)"""
+        restoring, self._restoring = self._restoring, True
+        try:
+            yield
+        finally:
+            self._restoring = restoring
+    
+    def on_plan_changed(self, event):
+        """Keep courses and the shared widgets in sync with the plan"""
+        event.course.assigned_semester = self.plan.semester_of(event.course)
+        
+        # Gray out / un-gray the course and update the graduation
+        # requirements with the next coalesced refresh. Moving a course
+        # between semesters does not change the requirement credits.
+        self._pending_courses.add(event.course)
+        if event.old_index is None or event.new_index is None:
+            self._requirements_dirty = True
+        self.schedule_refresh()
+        
+        if self.journal_mode and not self._restoring:
+            code = course_identifier(event.course)
+            if event.new_index is None:
+                self.append_journal(self.plan_journal, {"op": "unassign", "code": code})
+            else:
+                self.append_journal(self.plan_journal, {"op": "assign", "code": code, "semester": event.new_index})
+        self.mark_dirty()
+    
+    def on_favorite_changed(self, course):
+        """Save a course's new favorite status"""
+        if self.journal_mode:
+            self.append_journal(self.ui_journal, {"op": "favorite", "code": course.module_code,
+                                                  "value": course.favorite})
+        self.mark_dirty()
+    
+    def on_group_toggled(self, group_name, expanded):
+        """Save a course list group being expanded or collapsed"""
+        if self.journal_mode:
+            self.append_journal(self.ui_journal, {"op": "expand", "group": group_name, "value": expanded})
+        self.mark_dirty()
+    
+    def append_journal(self, journal, event):
+        """Append an event, compacting the journals once they get long"""
+        try:
+            journal.append(event)
+        except OSError as e:
+            print(f"Error writing journal: {e}")
+            return
+        if journal.event_count >= JOURNAL_COMPACT_EVENTS:
+            self.compact_journals()
+    
+    def compact_journals(self, force=False):
+        """Write the journaled changes into the slot and UI state files and
+        delete the journals. force=True writes both files even without changes."""
+        try:
+            if force or self.plan_journal.event_count:
+                data = self.plan_store.encode(self.plan.to_assignments(), self.slot_base, self.slot_parent)
+                atomic_write_json(self.state_file, data)
+                self.plan_journal.reset()
+            if force or self.ui_journal.event_count:
+                atomic_write_json(self.ui_state_file, self.build_ui_state())
+                self.ui_journal.reset()
+        except OSError as e:
+            print(f"Error compacting journal: {e}")
+            messagebox.showerror("Error", f"Failed to save state: {e}")
+    
+    def open_slot_journal(self):
+        """Switch the plan journal to the current slot"""
+        self.plan_journal.close()
+        self.plan_journal = Journal(self.plan_store.journal_file(self.current_slot))
+    
+    def mark_dirty(self):
+        """Note an unsaved change - it is saved automatically after a short delay"""
+        self.autosave.mark_dirty()
+    
+    @contextmanager
+    def batch_updates(self):
+        """Suppress per-change redraws inside the block and refresh once at the end"""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush_refresh()
+    
+    def schedule_refresh(self, widget=None):
+        """Queue a redraw for the next idle tick (or the end of the current batch).
+        
+        widget, if given, gets its refresh_layout() called once by the flush.
+        """
+        if widget is not None:
+            self._pending_widgets.add(widget)
+        if self._batch_depth == 0 and self._refresh_job is None:
+            self._refresh_job = self.root.after_idle(self.flush_refresh)
+    
+    def flush_refresh(self):
+        """Apply all pending redraws at once"""
+        if self._refresh_job is not None:
+            self.root.after_cancel(self._refresh_job)
+            self._refresh_job = None
+        
+        courses, self._pending_courses = self._pending_courses, set()
+        widgets, self._pending_widgets = self._pending_widgets, set()
+        requirements_dirty, self._requirements_dirty = self._requirements_dirty, False
+        
+        if hasattr(self, 'course_list'):
+            for course in courses:
+                self.course_list.refresh_course(course)
+        
+        for widget in widgets:
+            widget.refresh_layout()
+        
+        if requirements_dirty:
+            self.update_graduation_requirements()
+    
+    def on_history_key(self, event, action):
+        """Undo / redo shortcut, left to the widget while text is being edited"""
+        # ttk.Combobox is a ttk.Entry, so this covers the slot picker too
+        if isinstance(event.widget, (tk.Entry, ttk.Entry)):
+            return
+        action()
+    
+    def undo(self):
+        """Revert the last change to the plan"""
+        with self.batch_updates():
+            if not self.history.undo():
+                print("Nothing to undo")
+    
+    def redo(self):
+        """Apply the last undone change to the plan again"""
+        with self.batch_updates():
+            if not self.history.redo():
+                print("Nothing to redo")
+    
+    def auto_plan(self):
+        """Complete the plan automatically around the courses placed so far.
+        
+        The search runs on a worker thread so the window stays responsive;
+        its result is picked up by _poll_auto_plan().
+        """
+        if self.auto_plan_thread is not None:
+            print("Auto-plan is already running")
+            return
+        pinned = {course: self.plan.semester_index(course) for course in self.plan.assigned_courses()}
+        favorites = [course for course in self.courses if getattr(course, 'favorite', False)]
+        solver = PlanSolver(self.courses, self.requirement_rules,
+                            [semester.title for semester in self.plan.semesters],
+                            self.plan.semesters[0].max_lp, favorites, pinned)
+        
+        # The plan the search started from - its result only fits that plan
+        started = (self.current_slot, self.plan.to_assignments())
+        result = {}
+        
+        def run():
+            try:
+                result["plans"] = solver.solve(AUTO_PLAN_COUNT, AUTO_PLAN_TIME_BUDGET)
+            except Exception as e:
+                result["error"] = e
+        
+        self.root.config(cursor="watch")
+        self.auto_plan_thread = threading.Thread(target=run, name="auto-plan", daemon=True)
+        self.auto_plan_thread.start()
+        self.root.after(AUTO_PLAN_POLL_MS, self._poll_auto_plan, solver, started, result)
+    
+    def _poll_auto_plan(self, solver, started, result):
+        """Apply the auto-plan result once the worker thread is done"""
+        if self.auto_plan_thread.is_alive():
+            self.root.after(AUTO_PLAN_POLL_MS, self._poll_auto_plan, solver, started, result)
+            return
+        self.auto_plan_thread = None
+        self.root.config(cursor="")
+        
+        if "error" in result:
+            print(f"Error during auto-plan: {result['error']}")
+            messagebox.showerror("Auto-plan", f"Auto-plan failed: {result['error']}")
+            return
+        plans = result["plans"]
+        print(f"Auto-plan searched {solver.nodes} nodes, placed {solver.plans_evaluated} course selections"
+              f"{' (time budget used up)' if solver.timed_out else ''}")
+        
+        if started != (self.current_slot, self.plan.to_assignments()):
+            messagebox.showinfo("Auto-plan", "The plan was changed while auto-plan was running, "
+                                             "so its result was not applied.")
+            return
+        if not plans:
+            messagebox.showinfo("Auto-plan", "No plan fulfilling all requirements was found "
+                                             "around the courses placed so far.")
+            return
+        for plan in plans:
+            print(f"  score {plan.score}: {plan.semester_credits} LP per semester, {plan.favorites} favorites")
+        
+        # Apply the best plan as one undoable step. The solver's courses are
+        # used directly - mapping its codes back through course_by_code could
+        # swap a placed course for another one sharing its module code
+        with self.batch_updates(), self.history.group():
+            self.apply_placements(plans[0].placements)
+    
+    def compare_slots(self):
+        """Open the slot comparison window, or bring it to the front"""
+        window = getattr(self, 'compare_window', None)
+        if window is not None and window.winfo_exists():
+            window.lift()
+            return
+        self.compare_window = PlanCompareWindow(self.root, self)
     
     def on_close(self):
         """Handler for window close event"""
-        self.save_state()
+        self.save_state(wait=True)
         self.root.destroy()
     
-    def save_state(self):
-        """Save current state to file"""
+    def save_state(self, wait=False):
+        """Save current state to file.
+        
+        The file is written on the autosave thread; wait=True blocks until
+        it is on disk.
+        """
         try:
-            state = {
-                "semester_assignments": {},
-                "expanded_groups": self.course_list.expanded_groups,
-                "favorites": [],  # Add an array to store favorite courses
-                "window": {
-                    "width": self.root.winfo_width(),
-                    "height": self.root.winfo_height(),
-                }
-            }
-            
-            # Save course assignments to semesters
-            for i, semester_frame in enumerate(self.semester_frames):
-                # Each semester gets an array of course codes
-                course_codes = []
-                for course in semester_frame.courses:
-                    if hasattr(course, 'module_code') and course.module_code:
-                        course_codes.append(course.module_code)
-                        
-                state["semester_assignments"][str(i)] = course_codes
-            
-            # Save favorite courses
-            for course in self.courses:
-                if hasattr(course, 'favorite') and course.favorite and hasattr(course, 'module_code'):
-                    state["favorites"].append(course.module_code)
-            
-            # Write to file
-            with open(self.state_file, 'w', encoding='utf-8') as f:
-                json.dump(state, f, indent=2, ensure_ascii=False)
-                
-            print(f"State saved to {self.state_file}")
-            
-            # Update window title to show current slot
-            self.root.title(f"Semester Calendar Planner - {self.current_slot}")
-                
+            if self.journal_mode:
+                # The plan and UI state files are only written here; the
+                # autosave thread keeps the slot index up to date
+                self.compact_journals(force=True)
+            self.autosave.save_now(wait=wait)
         except Exception as e:
             print(f"Error saving state: {e}")
             messagebox.showerror("Error", f"Failed to save state: {e}")
     
-    def load_state(self):
-        """Load saved state if it exists"""
-        if not os.path.exists(self.state_file):
-            print(f"No saved state found for slot '{self.current_slot}'.")
+    def save_pending_changes(self):
+        """Save right away if there are changes the autosave timer has not written yet"""
+        if self.autosave.dirty:
+            self.save_state()
+    
+    def build_state_snapshot(self):
+        """Collect the files to save as (file path, JSON data) pairs on the Tk thread"""
+        # Save course assignments to semesters - each semester gets an
+        # array of course codes, or only the changes if the slot is a copy
+        data = self.plan_store.encode(self.plan.to_assignments(), self.slot_base, self.slot_parent)
+        
+        # Update the slot's summary in the index along with the slot file
+        meta = slot_metadata(self.plan, time.time(), self.plan_store.base_of(data))
+        self.slot_index.update(self.current_slot, meta)
+        
+        if self.journal_mode:
+            # Changes are already on disk in the journals
+            return [self.slot_index.snapshot()]
+        return [(self.state_file, data), (self.ui_state_file, self.build_ui_state()),
+                self.slot_index.snapshot()]
+    
+    def build_ui_state(self):
+        """State shared by all slots"""
+        state = {
+            # Copied, so the autosave thread never sees later changes
+            "expanded_groups": dict(self.course_list.expanded_groups),
+            "favorites": [],  # Add an array to store favorite courses
+            "window": {
+                "width": self.root.winfo_width(),
+                "height": self.root.winfo_height(),
+            }
+        }
+        
+        # Save favorite courses
+        for course in self.courses:
+            if hasattr(course, 'favorite') and course.favorite and hasattr(course, 'module_code'):
+                state["favorites"].append(course.module_code)
+        return state
+    
+    def load_ui_state(self):
+        """Apply the shared UI state, if it was saved before"""
+        state = self.plan_store.load_ui_state()
+        
+        # Replay the changes made since the file was written
+        events = self.ui_journal.read_events()
+        if events:
+            state = apply_ui_events(state or {}, events)
+            print(f"Replayed {len(events)} UI state changes from the journal")
+        
+        if state is not None:
+            self.apply_ui_state(state)
+            # The course list was drawn before favorites and expanded
+            # groups were known - redraw it with them
+            if hasattr(self, "course_list"):
+                self.course_list.display_courses()
+
+        # Without journal mode, fold a leftover journal into the UI state file
+        if events and not self.journal_mode:
+            self.compact_journals()
+    
+    def apply_ui_state(self, state):
+        """Apply window size, favorites and expanded groups from a saved state"""
+        # Set window size if specified
+        if "window" in state:
+            width = state["window"].get("width", 1600)
+            height = state["window"].get("height", 900)
+            self.root.geometry(f"{width}x{height}")
+        
+        # Load favorite courses
+        if "favorites" in state:
+            favorites = set(state["favorites"])
+            for course in self.courses:
+                course.favorite = course.module_code in favorites
+            print(f"Loaded {len(favorites)} favorites")
+        
+        # Set expanded groups state for course list
+        if "expanded_groups" in state and hasattr(self, "course_list"):
+            self.course_list.expanded_groups = state["expanded_groups"]
+        
+        self.ui_state_loaded = True
+    
+    def update_title(self, save_status=None):
+        """Show the current slot and the autosave status in the window title"""
+        if save_status is None:
+            save_status = self.autosave.status_text()
+        title = f"Semester Calendar Planner - {self.current_slot}"
+        if save_status:
+            title += f" ({save_status})"
+        self.root.title(title)
+    
+    def on_save_error(self, path, error):
+        """Report a failed background save"""
+        messagebox.showerror("Error", f"Failed to save state: {error}")
+    
+    def load_state(self, slot=None):
+        """Load a slot's plan (the current slot by default), from the slot
+        cache if it was used recently, and make it the current slot.
+        
+        The plan is changed into the saved one with as few moves as
+        possible, so courses both plans share keep their blocks. If the
+        slot cannot be read, the current slot and plan are left as they
+        are. Returns whether the slot was loaded.
+        """
+        slot = slot if slot is not None else self.current_slot
+        state_file = os.path.join(self.save_dir, f"{slot}.json")
+        cached = self.slot_cache.take(slot)
+        if cached is None and not os.path.exists(state_file):
+            print(f"No saved state found for slot '{slot}'.")
             # Create empty state file for this slot
+            self.set_current_slot(slot)
+            self.slot_base = None
+            self.slot_parent = None
+            with self.batch_updates(), self.restoring():
+                self.plan.clear()
+            self.history.clear()
             self.save_state()
-            return
+            return True
             
         try:
-            # Load state from file
-            with open(self.state_file, 'r', encoding='utf-8') as f:
-                state = json.load(f)
-            
-            # Set window size if specified
-            if "window" in state:
-                width = state["window"].get("width", 1600)
-                height = state["window"].get("height", 900)
-                self.root.geometry(f"{width}x{height}")
-            
-            # Create a lookup dictionary for faster course retrieval by code
-            course_by_code = {course.module_code: course for course in self.courses if hasattr(course, 'module_code')}
+            events = []
+            if cached is not None:
+                # Parsed when the slot was last left - no file needs to be read
+                assignments = cached.assignments
+                base, parent = cached.base, cached.parent
+                state = None
+            else:
+                # Load state from file, resolving copies against their base plan
+                state = self.plan_store.read_slot(slot)
+                assignments = self.plan_store.assignments_of(state)
+                base, parent = self.plan_store.base_of(state), state.get("parent")
                 
-            # Load favorite courses - IMPORTANT: Do this BEFORE creating the course list UI
-            if "favorites" in state:
-                favorites_count = 0
-                for module_code in state["favorites"]:
-                    if module_code in course_by_code:
-                        course_by_code[module_code].favorite = True
-                        favorites_count += 1
+                # Replay the changes journaled since the file was written
+                events = Journal(self.plan_store.journal_file(slot)).read_events()
+                if events:
+                    assignments = apply_plan_events(assignments, events)
+                    print(f"Replayed {len(events)} plan changes from the journal")
+        except Exception as e:
+            # Nothing has changed yet - the previous slot stays current, so
+            # its plan is not saved under the new slot's name
+            print(f"Error loading state: {e}")
+            messagebox.showerror("Error", f"Failed to load state: {e}")
+            return False
+        
+        # The slot was read - switch to it
+        self.set_current_slot(slot)
+        self.slot_base = base
+        self.slot_parent = parent
+        if cached is not None:
+            self.plan_journal.event_count = cached.journal_events
+        
+        try:
+            # Apply the whole state first and redraw once at the end
+            with self.batch_updates(), self.restoring():
+                # Slots in the old format carry their own favorites and UI
+                # state - use them until the shared UI state has been saved
+                legacy_ui_state = state is not None and not self.ui_state_loaded
+                if legacy_ui_state:
+                    self.apply_ui_state(state)
+                        
+                # Move the courses that differ into place
+                moves, problems = self.apply_assignments(assignments)
                 
-                print(f"Loaded {favorites_count} favorites")
+                # Favorites and expansion state changed - refresh the whole
+                # course list; placed courses are restyled one by one otherwise
+                if legacy_ui_state and hasattr(self, "course_list"):
+                    self.course_list.display_courses()
             
-            # Now that favorites are loaded, update course list display
-            if hasattr(self, "course_list"):
-                # Refresh course list to show favorites properly
-                self.course_list.display_courses()
-                
-            # Set expanded groups state for course list
-            if "expanded_groups" in state and hasattr(self, "course_list"):
-                self.course_list.expanded_groups = state["expanded_groups"]
-                self.course_list.display_courses()  # Refresh display with new expansion state
-                    
-            # Restore courses to semesters
-            if "semester_assignments" in state:
-                # Assign courses to semesters
-                for semester_idx, course_codes in state["semester_assignments"].items():
-                    semester_idx = int(semester_idx)
-                    if semester_idx < len(self.semester_frames):
-                        semester = self.semester_frames[semester_idx]
-                        for code in course_codes:
-                            if code in course_by_code:
-                                course = course_by_code[code]
-                                semester.add_course(course)
+            # The plan changes above only restored the file's content
+            self.history.clear()
+            self.autosave.mark_clean()
             
-            # Update window title to show current slot
-            self.root.title(f"Semester Calendar Planner - {self.current_slot}")
+            # Without journal mode, fold a leftover journal into the slot file
+            if events and not self.journal_mode:
+                self.compact_journals()
+            self.update_title()
                 
-            print(f"State loaded from {self.state_file}")
+            source = "slot cache" if cached is not None else self.state_file
+            print(f"State loaded from {source} ({moves} course moves)")
+            if problems:
+                self.report_load_problems(problems)
                 
         except Exception as e:
             print(f"Error loading state: {e}")
             messagebox.showerror("Error", f"Failed to load state: {e}")
+        return True
+    
+    def set_current_slot(self, slot):
+        """Make slot the current slot, with its file and journal"""
+        self.current_slot = slot
+        self.state_file = os.path.join(self.save_dir, f"{slot}.json")
+        self.open_slot_journal()
+    
+    def apply_assignments(self, assignments):
+        """Change the plan to the given semester assignments ({"0": [codes], ...})
+        with the fewest assign/unassign calls.
+        
+        Returns (number of changes, problems) with problems listing the
+        entries that could not be assigned, like Plan.load_assignments.
+        """
+        # Semester each course should end up in
+        target, problems = self.plan.resolve_assignments(assignments, self.course_by_code)
+        return self.apply_placements(target), problems
+    
+    def apply_placements(self, target):
+        """Change the plan so that exactly the courses of target ({Course:
+        semester index}) are placed, with the fewest assign/unassign calls.
+        Returns the number of changes."""
+        moves = 0
+        for course in self.plan.assigned_courses():
+            if course not in target:
+                self.plan.unassign(course)
+                moves += 1
+        for course, semester_idx in target.items():
+            if self.plan.semester_index(course) != semester_idx:
+                self.plan.assign(course, semester_idx)
+                moves += 1
+        return moves
+    
+    def report_load_problems(self, problems):
+        """Tell the user about saved courses that could not be placed - they
+        are dropped from the slot the next time it is saved"""
+        lines = []
+        for semester_idx, code, reason in problems:
+            if isinstance(semester_idx, int) and 0 <= semester_idx < len(self.plan.semesters):
+                semester = self.plan.semesters[semester_idx].title
+            else:
+                semester = f"semester {semester_idx}"
+            course = self.course_by_code.get(code)
+            if reason == "not offered" and course is not None:
+                line = f"{course.title} ({code}) is only offered in {course.semester} semesters, not in {semester}"
+            else:
+                line = f"{code} in {semester}: {reason}"
+            print(f"Skipped saved course: {line}")
+            lines.append(line)
+        
+        shown = "\n".join(lines[:10])
+        if len(lines) > 10:
+            shown += f"\n... and {len(lines) - 10} more"
+        messagebox.showwarning("Courses Not Loaded",
+                               f"{len(lines)} saved course(s) of slot '{self.current_slot}' could not be placed "
+                               f"and will be removed when the slot is saved:\n\n{shown}")
+    
+    def remember_current_slot(self):
+        """Keep the current slot's plan parsed in the slot cache before another slot is opened"""
+        self.slot_cache.put(self.current_slot, CachedSlot(
+            self.plan.to_assignments(), self.slot_base, self.slot_parent, self.plan_journal.event_count
+        ))
     
     def create_semesters(self):
-        """Create the semester frames in a 1x6 horizontal layout"""
+        """Create the semester frames in a horizontal layout"""
         # Clear any existing frames
         self.semester_frames = []
         
-        # Set up a row with 6 columns
-        for j in range(6):  # 6 columns for 6 semesters
+        # Set up a row with one column per semester of the plan
+        for j, semester in enumerate(self.plan.semesters):
             self.semesters_frame.grid_columnconfigure(j, weight=1, minsize=250)  # Minimum width of 250 pixels
             
-            # Generate semester name based on index
-            if j % 2 == 0:  # Even indexes (0, 2, 4) are now Summer semesters
-                semester_type = "SoSe"
-                year = 2025 + (j // 2)
-                semester_title = f"{semester_type} {year}"
-            else:  # Odd indexes (1, 3, 5) are now Winter semesters
-                semester_type = "WiSe"
-                year = 2025 + (j // 2)
-                semester_title = f"{semester_type} {year}/{year+1}"
-            
-            semester_frame = SemesterFrame(self.semesters_frame, semester_title, 30, self.drag_drop_manager)
+            semester_frame = SemesterFrame(self.semesters_frame, semester.title, semester.max_lp,
+                                           self.drag_drop_manager, plan=self.plan, index=j,
+                                           render_backend=RENDER_BACKEND)
             semester_frame.grid(row=0, column=j, sticky="nsew", padx=5, pady=5)  # All in row 0
             
             # Store reference to semester frame
@@ -517,26 +981,24 @@ class CalendarApp:
             # Get the absolute path to the resources directory
             courses_file = os.path.join(self.resources_dir, 'courses.json')
             
-            with open(courses_file, 'r', encoding='utf-8') as f:
-                courses_data = json.load(f)
-                
-            for course_data in courses_data:
-                # Check if the course has a title - if not, it's a placeholder entry
-                if 'title' in course_data:
-                    # Create a Course object from the data
-                    course = Course(
-                        title=course_data.get('title', 'Unnamed Course'),
-                        credits=course_data.get('credits', 0),
-                        exam_type=course_data.get('exam_type', ''),
-                        group=course_data.get('group', ''),
-                        module_code=course_data.get('module_code', ''),
-                        grading=course_data.get('grading', ''),
-                        semester=course_data.get('semester', '')
-                    )
-                    self.courses.append(course)
+            cache_file = os.path.join(self.cache_dir, 'courses.pickle')
+            
+            # Use the compiled catalog unless courses.json changed
+            start = time.perf_counter()
+            courses, source = load_course_catalog(courses_file, cache_file)
+            self.courses.extend(courses)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            print(f"Loaded {len(courses)} courses from {source} in {elapsed_ms:.1f} ms")
                     
         except Exception as e:
             print(f"Error loading courses: {e}")
+        
+        # Build the search index once for the course list filter
+        self.search_index = CourseSearchIndex(self.courses)
+        
+        # Compile the group -> requirement lookup for all groups of the catalog
+        self.requirement_rules = default_rules()
+        self.requirement_rules.compile_groups({course.group for course in self.courses})
     
     def update_graduation_requirements(self):
         """Update the graduation requirements display"""
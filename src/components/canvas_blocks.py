@@ -0,0 +1,192 @@
+from components.course_block import block_background_color
+
+
+class CanvasBlockRenderer:
+    """Draws course blocks and group headers as items on one canvas.
+
+    Instead of a frame with 5-7 child widgets per course, every block is a
+    rectangle plus a few text items sharing one tag per block.
+    Clicks are dispatched through tag bindings that are set up once per
+    canvas, so no per-block event bindings are needed.
+    """
+
+    PADDING = 5
+    LINE_HEIGHT = 15
+    TITLE_HEIGHT = 18
+    CHAR_WIDTH = 7  # Rough width of a title character, used for truncation
+
+    def __init__(self, canvas, drag_drop_manager=None, on_group_click=None):
+        self.canvas = canvas
+        self.drag_drop_manager = drag_drop_manager
+        self.on_group_click = on_group_click
+        self.blocks = {}  # Tag -> CanvasCourseBlock
+        self.headers = {}  # Tag -> CanvasGroupHeader
+
+        self.canvas.tag_bind("course_block", "<ButtonPress-1>", self._on_block_press)
+        self.canvas.tag_bind("group_header", "<ButtonPress-1>", self._on_header_press)
+
+    def block_height(self, course, is_placed=False):
+        """Natural height of a course block"""
+        lines = 1  # Credits
+        lines += sum(1 for value in (course.module_code, course.group, course.semester) if value)
+        if is_placed:
+            lines += 1
+        return 2 * self.PADDING + self.TITLE_HEIGHT + lines * self.LINE_HEIGHT
+
+    def _current_tags(self):
+        """Tags of the item under the mouse"""
+        items = self.canvas.find_withtag("current")
+        return self.canvas.gettags(items[0]) if items else ()
+
+    def _on_block_press(self, event):
+        tags = self._current_tags()
+        block = next((self.blocks[tag] for tag in tags if tag in self.blocks), None)
+        if block is None or block.is_placed:
+            return "break"
+
+        if "favorite_star" in tags:
+            block.toggle_favorite()
+        elif self.drag_drop_manager:
+            self.drag_drop_manager.start_drag(event, block)
+        return "break"
+
+    def _on_header_press(self, event):
+        tags = self._current_tags()
+        header = next((self.headers[tag] for tag in tags if tag in self.headers), None)
+        if header is not None and self.on_group_click:
+            self.on_group_click(header.group_name)
+        return "break"
+
+
+class CanvasCourseBlock:
+    """A course block drawn on a canvas.
+
+    Offers the parts of the CourseBlock interface the course list, the
+    semester frames and the drag manager use (course, is_placed,
+    bind_course, destroy).
+    """
+
+    def __init__(self, renderer, course, x, y, width, height=None, is_placed=False):
+        self.renderer = renderer
+        self.canvas = renderer.canvas
+        self.x = x
+        self.y = y
+        self.width = width
+        self.fixed_height = height  # None = natural height of the course
+        self.height = 0
+        self.tag = f"block{id(self)}"
+        self.bind_course(course, is_placed)
+
+    def bind_course(self, course, is_placed=False):
+        """(Re)draw the block for the given course"""
+        self.course = course
+        self.is_placed = is_placed
+        self._draw()
+
+    def _draw(self):
+        self._delete_items()
+        renderer = self.renderer
+        course = self.course
+        renderer.blocks[self.tag] = self
+        tags = ("course_block", self.tag)
+
+        self.height = self.fixed_height or renderer.block_height(course, self.is_placed)
+        x, y, width = self.x, self.y, self.width
+        bg_color = block_background_color(course, self.is_placed)
+        text_color = "#A0A0A0" if self.is_placed else "#000000"  # Gray text if placed
+
+        self.canvas.create_rectangle(x, y, x + width, y + self.height,
+                                     fill=bg_color, outline="#B0B0B0", tags=tags)
+
+        # Favorite star
+        is_favorite = getattr(course, 'favorite', False)
+        self.canvas.create_text(
+            x + width - renderer.PADDING, y + renderer.PADDING,
+            text="★" if is_favorite else "☆",
+            anchor="ne",
+            font=("Arial", 10),
+            fill="#FFB300" if is_favorite else "#757575",
+            tags=tags + ("favorite_star",)
+        )
+
+        # Course title, cut to the block width
+        max_chars = max((width - 2 * renderer.PADDING - 20) // renderer.CHAR_WIDTH, 4)
+        title = course.title if len(course.title) <= max_chars else course.title[:max_chars - 1] + "…"
+        self.canvas.create_text(x + renderer.PADDING, y + renderer.PADDING, text=title, anchor="nw",
+                                font=("Helvetica", 10, "bold"), fill=text_color, tags=tags)
+
+        # Detail lines
+        lines = [(f"{course.credits} LP", ("Helvetica", 9), text_color)]
+        if course.module_code:
+            lines.append((f"Code: {course.module_code}", ("Helvetica", 8), text_color))
+        if course.group:
+            lines.append((f"Group: {course.group}", ("Helvetica", 8), text_color))
+        if course.semester:
+            lines.append((f"Offered: {course.semester}", ("Helvetica", 8), text_color))
+        if self.is_placed:
+            assigned = getattr(course, 'assigned_semester', None)
+            placement_info = f"Placed in {assigned.title}" if assigned else "Already placed"
+            lines.append((placement_info, ("Helvetica", 8, "italic"), "#FF6B6B"))
+
+        line_y = y + renderer.PADDING + renderer.TITLE_HEIGHT
+        for text, font, color in lines:
+            self.canvas.create_text(x + renderer.PADDING, line_y, text=text, anchor="nw",
+                                    font=font, fill=color, tags=tags)
+            line_y += renderer.LINE_HEIGHT
+
+    def move_to(self, x, y):
+        """Move the block without redrawing it"""
+        self.canvas.move(self.tag, x - self.x, y - self.y)
+        self.x = x
+        self.y = y
+
+    def set_width(self, width):
+        if width != self.width:
+            self.width = width
+            self._draw()
+
+    def toggle_favorite(self):
+        """Toggle favorite status of the course"""
+        self.course.favorite = not self.course.favorite
+        print(f"Course '{self.course.title}' favorite status: {self.course.favorite}")
+        self._draw()
+
+        # Let the app save the change with its next autosave
+        drag_drop_manager = self.renderer.drag_drop_manager
+        if drag_drop_manager and hasattr(drag_drop_manager, 'app'):
+            drag_drop_manager.app.on_favorite_changed(self.course)
+
+    def _delete_items(self):
+        self.canvas.delete(self.tag)
+        self.renderer.blocks.pop(self.tag, None)
+
+    def destroy(self):
+        self._delete_items()
+
+
+class CanvasGroupHeader:
+    """A course list group header drawn on a canvas.
+
+    configure(text=...) matches the ttk.Label the course list updates.
+    """
+
+    def __init__(self, renderer, group_name, text, is_expanded, x, y, width):
+        self.renderer = renderer
+        self.canvas = renderer.canvas
+        self.group_name = group_name
+        self.tag = f"header{id(self)}"
+        renderer.headers[self.tag] = self
+        tags = ("group_header", self.tag)
+
+        self.canvas.create_line(x, y + 2, x + width, y + 2, fill="#C0C0C0", tags=tags)
+        self.canvas.create_text(x, y + 10, anchor="nw", font=("Helvetica", 10),
+                                text="▼" if is_expanded else "►", tags=tags)  # Down/right arrow
+        self.label_item = self.canvas.create_text(x + 20, y + 10, anchor="nw", text=text,
+                                                  font=("Helvetica", 10, "bold"), tags=tags)
+
+    def configure(self, text):
+        self.canvas.itemconfig(self.label_item, text=text)
+
+    def destroy(self):
+        self.canvas.delete(self.tag)
+        self.renderer.headers.pop(self.tag, None)
@@ -1,19 +1,26 @@
 import tkinter as tk
 from tkinter import ttk
 
-class CourseBlock(tk.Frame):
-    # Colors for different requirement groups
-    GROUP_COLORS = {
-        "1.": "#D4E6F1",  # Kernbereich - Informatik und Mathematik: Light blue
-        "2.": "#D5F5E3",  # Kernbereich - Simulation und Optimierung: Light green
-        "3.": "#E8DAEF",  # Kernbereich - Messen, Steuern, Regeln: Light purple
-        "4.": "#FDEBD0",  # Profilbereich: Light orange
-        "6.": "#FADBD8",  # Projekt: Light red
-        "7.": "#F9E79F",  # Freiwahlbereich: Light yellow
-        "8.": "#D1F2EB",  # Fachpraktikum: Light cyan
-        "9.": "#FDEDEC",  # Masterarbeit: Light pink
-    }
+from models.requirements import default_rules
+
+def block_background_color(course, is_placed=False):
+    """Determine a course block's background color based on the course group"""
+    if is_placed:
+        return "#F0F0F0"  # Light gray for placed courses
     
+    if hasattr(course, 'group') and course.group:
+        # Check if this course is a favorite
+        if hasattr(course, 'favorite') and course.favorite:
+            return "#FFF9C4"  # Light yellow for favorites takes precedence
+        
+        # Otherwise use the color of the group's requirement
+        color = default_rules().color_for_group(course.group)
+        if color:
+            return color
+    
+    return "#F5F5F5"  # Default light gray
+
+class CourseBlock(tk.Frame):
     def __init__(self, parent, course, drag_drop_manager=None, is_placed=False):
         super().__init__(parent, relief=tk.RAISED, borderwidth=1, padx=5, pady=5)
         self.course = course
@@ -46,96 +53,89 @@ class CourseBlock(tk.Frame):
         self.fav_btn.pack(side=tk.RIGHT)
         
         # Course title
-        text_color = "#A0A0A0" if is_placed else "#000000"  # Gray text if placed
         self.title_label = tk.Label(
             header_frame, 
-            text=self.course.title, 
             font=("Helvetica", 10, "bold"),
             anchor="w",
-            bg=bg_color,
-            fg=text_color
+            bg=bg_color
         )
         self.title_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
         
-        # Course credits
-        tk.Label(
-            self, 
-            text=f"{self.course.credits} LP", 
-            font=("Helvetica", 9),
+        # Detail labels - created once and reconfigured by bind_course() so the
+        # block can be recycled for a different course by the course list
+        self.credits_label = tk.Label(self, font=("Helvetica", 9), bg=bg_color)
+        self.code_label = tk.Label(self, font=("Helvetica", 8), bg=bg_color)
+        self.group_label = tk.Label(self, font=("Helvetica", 8), bg=bg_color)
+        self.offered_label = tk.Label(self, font=("Helvetica", 8), bg=bg_color)
+        self.placement_label = tk.Label(
+            self,
+            font=("Helvetica", 8, "italic"),
             bg=bg_color,
-            fg=text_color
-        ).pack(anchor="w")
-        
-        # Course module code if available
-        if hasattr(self.course, 'module_code') and self.course.module_code:
-            tk.Label(
-                self, 
-                text=f"Code: {self.course.module_code}", 
-                font=("Helvetica", 8),
-                bg=bg_color,
-                fg=text_color
-            ).pack(anchor="w")
-            
-        # Course group if available
-        if hasattr(self.course, 'group') and self.course.group:
-            tk.Label(
-                self, 
-                text=f"Group: {self.course.group}", 
-                font=("Helvetica", 8),
-                bg=bg_color,
-                fg=text_color
-            ).pack(anchor="w")
-        
-        # Course semester availability if available
-        if hasattr(self.course, 'semester') and self.course.semester:
-            tk.Label(
-                self, 
-                text=f"Offered: {self.course.semester}", 
-                font=("Helvetica", 8),
-                bg=bg_color,
-                fg=text_color
-            ).pack(anchor="w")
+            fg="#FF6B6B"  # Red-ish color
+        )
+        self.detail_labels = [
+            self.credits_label,
+            self.code_label,
+            self.group_label,
+            self.offered_label,
+            self.placement_label,
+        ]
         
-        # If course is placed, add an indicator label
-        if is_placed:
-            placement_info = f"Placed in {course.assigned_semester.title}" if course.assigned_semester else "Already placed"
-            tk.Label(
-                self,
-                text=placement_info,
-                font=("Helvetica", 8, "italic"),
-                bg=bg_color,
-                fg="#FF6B6B"  # Red-ish color
-            ).pack(anchor="w")
-        
-        # Make draggable only if not placed
-        if self.drag_drop_manager and not is_placed:
+        self.bind_course(course, is_placed)
+        
+        # Make draggable - on_drag_start ignores blocks that are already placed
+        if self.drag_drop_manager:
             self.bind("<ButtonPress-1>", self.on_drag_start)
             self.title_label.bind("<ButtonPress-1>", self.on_drag_start)
             for child in self.winfo_children():
                 child.bind("<ButtonPress-1>", self.on_drag_start)
     
-    def get_background_color(self):
-        """Determine the background color based on the course group"""
-        if self.is_placed:
-            return "#F0F0F0"  # Light gray for placed courses
+    def bind_course(self, course, is_placed=False):
+        """Show the given course in this block, reusing the existing widgets"""
+        self.course = course
+        self.is_placed = is_placed
+        text_color = "#A0A0A0" if is_placed else "#000000"  # Gray text if placed
         
-        if hasattr(self.course, 'group') and self.course.group:
-            # Check if this course is a favorite
-            if hasattr(self.course, 'favorite') and self.course.favorite:
-                return "#FFF9C4"  # Light yellow for favorites takes precedence
-            
-            # Otherwise use group-based color
-            for prefix, color in self.GROUP_COLORS.items():
-                if self.course.group.startswith(prefix):
-                    return color
+        self.title_label.config(text=course.title, fg=text_color)
+        self.credits_label.config(text=f"{course.credits} LP", fg=text_color)
         
-        return "#F5F5F5"  # Default light gray
+        # Optional details are only shown when the course provides them
+        details = [
+            (self.code_label, f"Code: {course.module_code}" if getattr(course, 'module_code', None) else ""),
+            (self.group_label, f"Group: {course.group}" if getattr(course, 'group', None) else ""),
+            (self.offered_label, f"Offered: {course.semester}" if getattr(course, 'semester', None) else ""),
+        ]
+        
+        # If course is placed, add an indicator label
+        placement_info = ""
+        if is_placed:
+            assigned = getattr(course, 'assigned_semester', None)
+            placement_info = f"Placed in {assigned.title}" if assigned else "Already placed"
+        details.append((self.placement_label, placement_info))
+        
+        for label in self.detail_labels:
+            label.pack_forget()
+        self.credits_label.pack(anchor="w")
+        for label, text in details:
+            if label is not self.placement_label:
+                label.config(fg=text_color)
+            label.config(text=text)
+            if text:
+                label.pack(anchor="w")
+        
+        # Disable favorite button if placed
+        self.fav_btn.config(state=tk.DISABLED if is_placed else tk.NORMAL)
+        self.update_favorite_display()
+        self.update_appearance()
+    
+    def get_background_color(self):
+        """Determine the background color based on the course group"""
+        return block_background_color(self.course, self.is_placed)
     
     def update_favorite_display(self):
         """Update the favorite button text based on status"""
         if hasattr(self.course, 'favorite') and self.course.favorite:
             self.fav_text.set("★")  # Solid star
-            print(f"Course {self.course.title} is marked as favorite")
         else:
             self.fav_text.set("☆")  # Empty star
     
@@ -170,13 +170,17 @@ class CourseBlock(tk.Frame):
         self.update_favorite_display()
         self.update_appearance()
         
-        # Save state if possible
+        # Let the app save the change with its next autosave
         if self.drag_drop_manager and hasattr(self.drag_drop_manager, 'app'):
-            self.drag_drop_manager.app.save_state()
+            self.drag_drop_manager.app.on_favorite_changed(self.course)
     
     def on_drag_start(self, event):
         """Start dragging this course block"""
         if self.drag_drop_manager:
+            # Courses that are already placed cannot be dragged from the list
+            if self.is_placed:
+                return "break"
+            
             # Pass the click to the star button if it was clicked
             if event.widget == self.fav_btn:
                 self.toggle_favorite()
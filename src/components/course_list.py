@@ -1,17 +1,69 @@
 import tkinter as tk
 from tkinter import ttk
+from bisect import bisect_right
 
 from components.course_block import CourseBlock
+from components.canvas_blocks import CanvasBlockRenderer, CanvasCourseBlock, CanvasGroupHeader
+from data.search_index import CourseSearchIndex
+from models.course import GROUPS, OFFERED_BOTH, OFFERED_SOSE, OFFERED_WISE
 
 class CourseList(ttk.Frame):
-    def __init__(self, parent, courses, drag_drop_manager):
+    # Fixed row heights used by the virtualized list (in pixels)
+    HEADER_ROW_HEIGHT = 40
+    COURSE_ROW_HEIGHT = 124
+    ROW_PADDING = 4
+    # Rows materialized above and below the visible part of the canvas
+    OVERSCAN_ROWS = 3
+    # Delay before a search runs, so that fast typing only filters once
+    SEARCH_DEBOUNCE_MS = 150
+    # Course blocks created per time slice when rendering without virtualization
+    RENDER_CHUNK_SIZE = 25
+    # Semester filter choice -> (offering bits to test, require all bits)
+    SEMESTER_FILTERS = {
+        "WiSe": (OFFERED_WISE, False),
+        "SoSe": (OFFERED_SOSE, False),
+        "WiSe/SoSe": (OFFERED_BOTH, True),
+    }
+    
+    def __init__(self, parent, courses, drag_drop_manager, virtualized=True, search_index=None,
+                 render_backend="widgets"):
         super().__init__(parent)
         
         self.courses = courses
+        # Normalized search data, normally built once by the app when loading courses
+        self.search_index = search_index if search_index is not None else CourseSearchIndex(courses)
         self.drag_drop_manager = drag_drop_manager
         self.filtered_courses = courses
         self._expanded_groups = {}  # Track which groups are expanded
         
+        # Virtualized mode only creates widgets for the rows inside the viewport
+        # The canvas backend draws the rows as canvas items and needs the
+        # row layout of virtualized mode
+        self.render_backend = render_backend
+        self.virtualized = virtualized or render_backend == "canvas"
+        self._rows = []  # ("group", name, courses) or ("course", course) tuples
+        self._row_offsets = []  # Top y position of each row
+        self._content_height = 0
+        self._materialized_rows = {}  # Row index -> (canvas item, widget)
+        self._block_pool = []  # Recycled (canvas item, CourseBlock) pairs
+        self._header_pool = []  # Recycled (canvas item, header frame) pairs
+        self._viewport_job = None
+        
+        # Widgets for the displayed courses and groups, so that a single
+        # course changing placement only restyles its own block and header
+        self.course_blocks = {}  # Course -> CourseBlock (materialized rows only when virtualized)
+        self.group_labels = {}  # Group name -> header label
+        self._displayed_groups = {}  # Group name -> filtered courses in that group
+        self._placed_counts = {}  # Group name -> number of placed courses
+        self._displayed_courses = set()
+        self._placed_courses = set()  # Displayed courses that are placed
+        
+        # Filter scheduling - every new filter request bumps the generation,
+        # and pending searches or render chunks of older generations are dropped
+        self._filter_generation = 0
+        self._filter_job = None
+        self._render_job = None
+        
         # Create UI elements
         self.create_widgets()
         
@@ -80,16 +132,26 @@ class CourseList(ttk.Frame):
         canvas_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
         self.canvas = tk.Canvas(canvas_frame)
-        scrollbar = ttk.Scrollbar(canvas_frame, orient="vertical", command=self.canvas.yview)
-        
-        self.canvas.configure(yscrollcommand=scrollbar.set)
+        self.scrollbar = ttk.Scrollbar(canvas_frame, orient="vertical", command=self.canvas.yview)
+        self.renderer = None
+        if self.render_backend == "canvas":
+            self.renderer = CanvasBlockRenderer(self.canvas, self.drag_drop_manager,
+                                                on_group_click=self.toggle_virtual_group)
+        
+        if self.virtualized:
+            # Re-check which rows are visible whenever the view moves
+            self.canvas.configure(yscrollcommand=self._on_canvas_yview)
+        else:
+            self.canvas.configure(yscrollcommand=self.scrollbar.set)
         
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
-        # Create a frame inside the canvas to hold the courses
+        # Create a frame inside the canvas to hold the courses (unused in
+        # virtualized mode, where rows are placed directly on the canvas)
         self.courses_frame = ttk.Frame(self.canvas)
-        self.canvas_window = self.canvas.create_window((0, 0), window=self.courses_frame, anchor="nw")
+        if not self.virtualized:
+            self.canvas_window = self.canvas.create_window((0, 0), window=self.courses_frame, anchor="nw")
         
         # Update scrollregion when the size of the frame changes
         self.courses_frame.bind("<Configure>", self.on_frame_configure)
@@ -107,13 +169,31 @@ class CourseList(ttk.Frame):
 
     def on_frame_configure(self, event=None):
         """Update the scroll region to encompass the inner frame"""
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        if self.virtualized:
+            self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), self._content_height))
+        else:
+            self.canvas.configure(scrollregion=self.canvas.bbox("all"))
     
     def on_canvas_configure(self, event=None):
         """Resize the inner frame to match the canvas width"""
         if event:
             canvas_width = event.width
-            self.canvas.itemconfig(self.canvas_window, width=canvas_width)
+            if self.renderer:
+                # Drawn rows are cheap - redraw the visible ones at the new width
+                for row_index in list(self._materialized_rows):
+                    self._release_row(row_index)
+                self.on_frame_configure()
+                self._schedule_viewport_update()
+            elif self.virtualized:
+                # Resize every row window, including the recycled ones
+                row_width = self._row_width(canvas_width)
+                items = list(self._materialized_rows.values()) + self._block_pool + self._header_pool
+                for item, _ in items:
+                    self.canvas.itemconfig(item, width=row_width)
+                self.on_frame_configure()
+                self._schedule_viewport_update()
+            else:
+                self.canvas.itemconfig(self.canvas_window, width=canvas_width)
     
     def bind_mousewheel(self):
         """Bind mousewheel events to scroll the canvas"""
@@ -154,44 +234,42 @@ class CourseList(ttk.Frame):
     
     def on_filter_changed(self, event=None):
         """Handle filter change events"""
+        # Anything still scheduled is superseded by this run
+        self._cancel_pending_filter()
+        
         # Get filter values
         group_filter = self.group_var.get()
         semester_filter = self.semester_var.get()
-        search_text = self.search_var.get().lower()
+        search_text = self.search_var.get()
         favorites_only = self.show_favorites_var.get()
         
+        # Resolve the search text through the index - only matching courses
+        # are checked against the remaining filters
+        if search_text.strip():
+            candidates = self.search_index.search(search_text)
+        else:
+            candidates = self.courses
+        
+        # Filters compare the courses' integer codes, not strings
+        group_code = GROUPS.lookup(group_filter) if group_filter != "All" else None
+        semester_bits, all_bits = self.SEMESTER_FILTERS.get(semester_filter, (0, False))
+        
         # Apply filters
         self.filtered_courses = []
-        for course in self.courses:
-            # Check if course has required attributes
-            if not hasattr(course, 'title'):
-                continue
-            
+        for course in candidates:
             # Check group filter
-            if group_filter != "All" and course.group != group_filter:
+            if group_filter != "All" and course.group_code != group_code:
                 continue
                 
             # Check semester filter
             if semester_filter != "All":
-                if not hasattr(course, 'semester') or course.semester is None:
-                    continue
-                if semester_filter not in course.semester:
+                offered = course.offering & semester_bits
+                if not offered or (all_bits and offered != semester_bits):
                     continue
                     
             # Check favorites filter
             if favorites_only and not (hasattr(course, 'favorite') and course.favorite):
                 continue
-                
-            # Check search text
-            if search_text:
-                # Search in title, description, and module code
-                title_match = search_text in course.title.lower()
-                desc_match = hasattr(course, 'description') and search_text in course.description.lower()
-                code_match = hasattr(course, 'module_code') and search_text in course.module_code.lower()
-                group_match = hasattr(course, 'group') and search_text in course.group.lower()
-                
-                if not (title_match or desc_match or code_match or group_match):
-                    continue
                     
             # If all filters passed, add to filtered list
             self.filtered_courses.append(course)
@@ -205,9 +283,16 @@ class CourseList(ttk.Frame):
         self.group_var.set("All")
         self.semester_var.set("All")
         self.show_favorites_var.set(False)
+        self._cancel_pending_filter()
         self.filtered_courses = self.courses
         self.display_courses()
     
+    def toggle_virtual_group(self, group_name):
+        """Toggle visibility of a group's courses in the virtualized list"""
+        self.expanded_groups[group_name] = not self.expanded_groups.get(group_name, True)
+        self.display_courses()
+        self._notify_group_toggled(group_name)
+    
     def toggle_group(self, group_name, content_frame, toggle_button):
         """Toggle visibility of courses in a group"""
         if self.expanded_groups.get(group_name, True):
@@ -223,16 +308,18 @@ class CourseList(ttk.Frame):
         
         # Update scroll region after toggle
         self.on_frame_configure()
+        self._notify_group_toggled(group_name)
     
-    def display_courses(self):
-        """Display the filtered courses, grouped by their categories"""
-        # Clear the current display
-        for widget in self.courses_frame.winfo_children():
-            widget.destroy()
-        
-        # Group courses by their group
+    def _notify_group_toggled(self, group_name):
+        """Let the app save the new expanded state of a group"""
+        app = getattr(self.drag_drop_manager, 'app', None)
+        if app is not None and hasattr(app, 'on_group_toggled'):
+            app.on_group_toggled(group_name, self.expanded_groups[group_name])
+    
+    def group_courses(self, courses):
+        """Group courses by their requirement group"""
         grouped_courses = {}
-        for course in self.filtered_courses:
+        for course in courses:
             if not hasattr(course, 'group') or course.group is None:
                 if "Uncategorized" not in grouped_courses:
                     grouped_courses["Uncategorized"] = []
@@ -241,8 +328,32 @@ class CourseList(ttk.Frame):
                 if course.group not in grouped_courses:
                     grouped_courses[course.group] = []
                 grouped_courses[course.group].append(course)
+        return grouped_courses
+    
+    def display_courses(self):
+        """Display the filtered courses, grouped by their categories"""
+        # Stop streaming blocks of a previous render
+        if self._render_job is not None:
+            self.after_cancel(self._render_job)
+            self._render_job = None
         
-        # Display courses by group
+        if self.virtualized:
+            self.display_courses_virtualized()
+            return
+        
+        # Clear the current display
+        for widget in self.courses_frame.winfo_children():
+            widget.destroy()
+        self.course_blocks = {}
+        self.group_labels = {}
+        
+        # Group courses by their group
+        grouped_courses = self.group_courses(self.filtered_courses)
+        self._reset_group_stats(grouped_courses)
+        
+        # Display courses by group - headers are created right away, the
+        # course blocks are queued and rendered in time slices
+        pending_blocks = []
         for group_name, courses in sorted(grouped_courses.items()):
             # Create group frame
             group_frame = ttk.Frame(self.courses_frame)
@@ -272,19 +383,15 @@ class CourseList(ttk.Frame):
             # Group header label
             group_label = ttk.Label(
                 header_frame, 
-                text=f"{group_name} ({len(courses)} courses)",
+                text=self._group_header_text(group_name),
                 font=("Helvetica", 10, "bold")
             )
             group_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+            self.group_labels[group_name] = group_label
             
-            # Add courses to the content frame
+            # Queue courses for the content frame
             for course in courses:
-                # Check if this course is already assigned to a semester
-                is_placed = hasattr(course, 'assigned_semester') and course.assigned_semester is not None
-                
-                # Create the course block
-                course_block = CourseBlock(content_frame, course, self.drag_drop_manager, is_placed)
-                course_block.pack(fill=tk.X, pady=2, padx=2)
+                pending_blocks.append((content_frame, course))
             
             # Show content frame only if group is expanded
             if is_expanded:
@@ -300,6 +407,257 @@ class CourseList(ttk.Frame):
         
         # Re-bind mousewheel events to all new widgets
         self._bind_mousewheel_recursive(self.courses_frame)
+        
+        # Render the first chunk now and stream the rest
+        self._render_chunk(self._filter_generation, pending_blocks, 0)
+    
+    def _render_chunk(self, generation, pending_blocks, start):
+        """Create the next slice of course blocks, yielding to the event loop in between"""
+        self._render_job = None
+        if generation != self._filter_generation:
+            return  # A newer filter result replaced this one
+        
+        end = min(start + self.RENDER_CHUNK_SIZE, len(pending_blocks))
+        for content_frame, course in pending_blocks[start:end]:
+            # Check if this course is already assigned to a semester
+            is_placed = course in self._placed_courses
+            
+            # Create the course block
+            course_block = CourseBlock(content_frame, course, self.drag_drop_manager, is_placed)
+            course_block.pack(fill=tk.X, pady=2, padx=2)
+            self.course_blocks[course] = course_block
+            self._bind_mousewheel_recursive(course_block)
+        
+        if end < len(pending_blocks):
+            self._render_job = self.after(1, self._render_chunk, generation, pending_blocks, end)
+        else:
+            self.on_frame_configure()
+    
+    def display_courses_virtualized(self):
+        """Lay out the filtered courses as fixed-height rows and only create
+        widgets for the rows that are currently visible"""
+        # Flatten the groups into rows and remember where each row starts
+        grouped_courses = self.group_courses(self.filtered_courses)
+        self._reset_group_stats(grouped_courses)
+        
+        self._rows = []
+        self._row_offsets = []
+        y = 0
+        for group_name, courses in sorted(grouped_courses.items()):
+            self._rows.append(("group", group_name, courses))
+            self._row_offsets.append(y)
+            y += self.HEADER_ROW_HEIGHT
+            
+            if self.expanded_groups.get(group_name, True):  # Default to expanded
+                for course in courses:
+                    self._rows.append(("course", course))
+                    self._row_offsets.append(y)
+                    y += self.COURSE_ROW_HEIGHT
+        self._content_height = y
+        
+        # The row layout changed, so every visible widget has to be rebound
+        for row_index in list(self._materialized_rows):
+            self._release_row(row_index)
+        
+        # Update the scroll region and show the rows in the viewport
+        self.on_frame_configure()
+        self._update_viewport()
+    
+    def _row_width(self, canvas_width=None):
+        """Width of a row window for the given canvas width"""
+        if canvas_width is None:
+            canvas_width = self.canvas.winfo_width()
+        return max(canvas_width - 2 * self.ROW_PADDING, 1)
+    
+    def _on_canvas_yview(self, first, last):
+        """Forward scroll updates to the scrollbar and refresh visible rows"""
+        self.scrollbar.set(first, last)
+        self._schedule_viewport_update()
+    
+    def _schedule_viewport_update(self):
+        """Coalesce viewport updates into one per idle cycle"""
+        if self._viewport_job is None:
+            self._viewport_job = self.after_idle(self._update_viewport)
+    
+    def _update_viewport(self):
+        """Materialize the rows in the viewport and recycle all others"""
+        if self._viewport_job is not None:
+            self.after_cancel(self._viewport_job)
+            self._viewport_job = None
+        
+        if not self._rows:
+            return
+        
+        # Find the rows overlapping the visible area plus some overscan
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        first = max(bisect_right(self._row_offsets, top) - 1 - self.OVERSCAN_ROWS, 0)
+        last = min(bisect_right(self._row_offsets, bottom) + self.OVERSCAN_ROWS, len(self._rows))
+        
+        # Recycle rows that scrolled out of view
+        for row_index in list(self._materialized_rows):
+            if row_index < first or row_index >= last:
+                self._release_row(row_index)
+        
+        # Create or reuse widgets for rows that scrolled into view
+        for row_index in range(first, last):
+            if row_index not in self._materialized_rows:
+                self._materialize_row(row_index)
+    
+    def _materialize_row(self, row_index):
+        """Show a row on the canvas, reusing a pooled widget if possible"""
+        row = self._rows[row_index]
+        y = self._row_offsets[row_index]
+        
+        if self.renderer:
+            self._draw_row(row_index, row, y)
+            return
+        
+        if row[0] == "group":
+            pool = self._header_pool
+            height = self.HEADER_ROW_HEIGHT
+        else:
+            pool = self._block_pool
+            height = self.COURSE_ROW_HEIGHT
+        
+        if pool:
+            item, widget = pool.pop()
+        else:
+            if row[0] == "group":
+                widget = self._create_group_header()
+            else:
+                widget = CourseBlock(self.canvas, row[1], self.drag_drop_manager)
+            item = self.canvas.create_window(
+                self.ROW_PADDING, y,
+                window=widget,
+                anchor="nw",
+                width=self._row_width()
+            )
+            self._bind_mousewheel_recursive(widget)
+        
+        # Bind the row's data to the widget
+        if row[0] == "group":
+            self._bind_group_header(widget, row[1])
+            self.group_labels[row[1]] = widget.group_label
+        else:
+            course = row[1]
+            widget.bind_course(course, course in self._placed_courses)
+            self.course_blocks[course] = widget
+        
+        self.canvas.coords(item, self.ROW_PADDING, y + self.ROW_PADDING // 2)
+        self.canvas.itemconfig(item, height=height - self.ROW_PADDING, state="normal")
+        self._materialized_rows[row_index] = (item, widget)
+    
+    def _draw_row(self, row_index, row, y):
+        """Draw a row with the canvas backend"""
+        x = self.ROW_PADDING
+        width = self._row_width()
+        if row[0] == "group":
+            group_name = row[1]
+            handle = CanvasGroupHeader(self.renderer, group_name, self._group_header_text(group_name),
+                                       self.expanded_groups.get(group_name, True), x, y, width)
+            self.group_labels[group_name] = handle
+        else:
+            course = row[1]
+            handle = CanvasCourseBlock(self.renderer, course, x, y + self.ROW_PADDING // 2, width,
+                                       height=self.COURSE_ROW_HEIGHT - self.ROW_PADDING,
+                                       is_placed=course in self._placed_courses)
+            self.course_blocks[course] = handle
+        self._materialized_rows[row_index] = (None, handle)
+    
+    def _release_row(self, row_index):
+        """Hide a row and return its widget to the matching pool"""
+        item, widget = self._materialized_rows.pop(row_index)
+        if item is None:
+            # Drawn row - deleting its items is as cheap as hiding them
+            widget.destroy()
+            if isinstance(widget, CanvasCourseBlock):
+                if self.course_blocks.get(widget.course) is widget:
+                    del self.course_blocks[widget.course]
+            elif self.group_labels.get(widget.group_name) is widget:
+                del self.group_labels[widget.group_name]
+            return
+        self.canvas.itemconfig(item, state="hidden")
+        if isinstance(widget, CourseBlock):
+            if self.course_blocks.get(widget.course) is widget:
+                del self.course_blocks[widget.course]
+            self._block_pool.append((item, widget))
+        else:
+            for group_name, label in list(self.group_labels.items()):
+                if label is widget.group_label:
+                    del self.group_labels[group_name]
+            self._header_pool.append((item, widget))
+    
+    def _create_group_header(self):
+        """Create a reusable group header row"""
+        header_frame = ttk.Frame(self.canvas)
+        ttk.Separator(header_frame, orient='horizontal').pack(fill=tk.X, pady=(0, 5))
+        
+        header_frame.toggle_button = ttk.Button(header_frame, width=2)
+        header_frame.toggle_button.pack(side=tk.LEFT, padx=(0, 5))
+        
+        header_frame.group_label = ttk.Label(header_frame, font=("Helvetica", 10, "bold"))
+        header_frame.group_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        return header_frame
+    
+    def _bind_group_header(self, header_frame, group_name):
+        """Show the given group in a header row"""
+        is_expanded = self.expanded_groups.get(group_name, True)  # Default to expanded
+        header_frame.toggle_button.configure(
+            text="▼" if is_expanded else "►",  # Down/right arrow
+            command=lambda g=group_name: self.toggle_virtual_group(g)
+        )
+        header_frame.group_label.configure(text=self._group_header_text(group_name))
+    
+    @staticmethod
+    def is_course_placed(course):
+        """Check if a course is already assigned to a semester"""
+        return getattr(course, 'assigned_semester', None) is not None
+    
+    def _reset_group_stats(self, grouped_courses):
+        """Recount the placed courses of every displayed group"""
+        self._displayed_groups = grouped_courses
+        self._displayed_courses = set(self.filtered_courses)
+        self._placed_courses = set()
+        self._placed_counts = {}
+        for group_name, courses in grouped_courses.items():
+            placed = [course for course in courses if self.is_course_placed(course)]
+            self._placed_courses.update(placed)
+            self._placed_counts[group_name] = len(placed)
+    
+    def _group_header_text(self, group_name):
+        """Header text for a group, including how many of its courses are placed"""
+        count = len(self._displayed_groups.get(group_name, []))
+        placed = self._placed_counts.get(group_name, 0)
+        if placed:
+            return f"{group_name} ({count} courses, {placed} placed)"
+        return f"{group_name} ({count} courses)"
+    
+    def refresh_course(self, course):
+        """Update a single course after its semester assignment changed.
+        
+        Only the course's own block and its group header are touched; the
+        list is not rebuilt because the filtered set does not change.
+        """
+        is_placed = self.is_course_placed(course)
+        was_placed = course in self._placed_courses
+        
+        # Adjust the placed count of the course's group
+        group_name = course.group if getattr(course, 'group', None) is not None else "Uncategorized"
+        if is_placed != was_placed and course in self._displayed_courses:
+            if is_placed:
+                self._placed_courses.add(course)
+                self._placed_counts[group_name] += 1
+            else:
+                self._placed_courses.discard(course)
+                self._placed_counts[group_name] -= 1
+            
+            if group_name in self.group_labels:
+                self.group_labels[group_name].configure(text=self._group_header_text(group_name))
+        
+        # Restyle the block if it is currently shown
+        if course in self.course_blocks:
+            self.course_blocks[course].bind_course(course, is_placed)
     
     def update_filter_combos(self):
         """Update the values in the filter combo boxes"""
@@ -311,4 +669,19 @@ class CourseList(ttk.Frame):
     
     def on_search_changed(self, *args):
         """Handle search text changes"""
-        self.on_filter_changed()
\ No newline at end of file
+        # Merge keystrokes - restart the timer instead of filtering every time
+        self._cancel_pending_filter()
+        self._filter_job = self.after(self.SEARCH_DEBOUNCE_MS, self._run_scheduled_filter, self._filter_generation)
+    
+    def _run_scheduled_filter(self, generation):
+        """Run a debounced search unless a newer filter request replaced it"""
+        self._filter_job = None
+        if generation == self._filter_generation:
+            self.on_filter_changed()
+    
+    def _cancel_pending_filter(self):
+        """Drop a scheduled search and start a new filter generation"""
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+            self._filter_job = None
+        self._filter_generation += 1
\ No newline at end of file
@@ -1,8 +1,12 @@
 import tkinter as tk
 from tkinter import messagebox
+from bisect import bisect_right
+
+from models.semester import is_compatible_semester
+from utils.constants import DRAG_FRAME_RATE
 
 class DragDropManager:
-    def __init__(self, app):
+    def __init__(self, app, frame_rate=DRAG_FRAME_RATE):
         self.app = app
         self.dragging = False
         self.dragged_item = None
@@ -13,9 +17,23 @@ class DragDropManager:
         self.potential_targets = []
         self.original_colors = {}
         
+        # Screen rectangles of the drop targets, sorted by left edge. Built
+        # once per drag and rebuilt only after a target moved or resized.
+        self._target_bounds = None  # [(x1, y1, x2, y2, target), ...]
+        self._target_lefts = []
+        
+        # Frame pacing - motion events only record the cursor position, the
+        # ghost window and hover state are updated at most once per frame.
+        # A frame rate of 0 or None updates on every motion event.
+        self.frame_interval_ms = int(1000 / frame_rate) if frame_rate else 0
+        self._frame_job = None
+        self._pending_position = None
+        
     def register_drop_target(self, target):
         """Register a frame as a potential drop target"""
         self.potential_targets.append(target)
+        target.bind("<Configure>", self.invalidate_target_geometry, add="+")
+        self.invalidate_target_geometry()
         self.original_colors[target] = target.cget("background")
         print(f"Registered drop target: {target}")
         
@@ -51,6 +69,9 @@ class DragDropManager:
         # Position the window at the cursor
         self.temp_window.geometry(f"+{event.x_root-10}+{event.y_root-10}")
         
+        # Measure the drop targets once for this drag
+        self._build_target_geometry()
+        
         # Bind motion and button release events
         self.app.root.bind("<B1-Motion>", self.drag)
         self.app.root.bind("<ButtonRelease-1>", lambda e: self.end_drag())
@@ -62,66 +83,105 @@ class DragDropManager:
         if not self.dragging or not self.temp_window:
             return
         
-        # Move the drag representation with cursor
-        x = event.x_root
-        y = event.y_root
-        self.temp_window.geometry(f"+{x-10}+{y-10}")  # Offset slightly for better visibility
+        # Remember the latest position; the next frame picks it up
+        self._pending_position = (event.x_root, event.y_root)
         
-        # Reset highlight on all targets
-        for target in self.potential_targets:
-            if target in self.original_colors:
-                target.configure(background=self.original_colors[target])
+        if not self.frame_interval_ms:
+            self._render_frame()
+        elif self._frame_job is None:
+            self._frame_job = self.app.root.after(self.frame_interval_ms, self._render_frame)
+            
+        return "break"  # Prevent further event processing
+    
+    def _render_frame(self):
+        """Move the drag representation and update the hovered target"""
+        self._frame_job = None
+        if not self.dragging or not self.temp_window or self._pending_position is None:
+            return
         
-        # Find which target we're over
-        old_target = self.target_container
-        self.target_container = None
+        x, y = self._pending_position
+        self._pending_position = None
         
+        # Move the drag representation with cursor
+        self.temp_window.geometry(f"+{x-10}+{y-10}")  # Offset slightly for better visibility
+        
+        # Find which target we're over and only restyle when it changed
+        target = self.find_target(x, y)
+        if target is not self.target_container:
+            self._reset_highlight(self.target_container)
+            self.target_container = target
+            self._highlight(target)
+    
+    def invalidate_target_geometry(self, event=None):
+        """Forget the cached target rectangles, e.g. after a resize or scroll"""
+        self._target_bounds = None
+    
+    def _build_target_geometry(self):
+        """Read the screen rectangles of all targets once"""
+        bounds = []
         for target in self.potential_targets:
             # Get screen coordinates of the target
             x1 = target.winfo_rootx()
             y1 = target.winfo_rooty()
             x2 = x1 + target.winfo_width()
             y2 = y1 + target.winfo_height()
-            
-            # Check if cursor is over target
-            if x >= x1 and x <= x2 and y >= y1 and y <= y2:
-                self.target_container = target
-                
-                # Check if course is compatible with this semester
-                if self.dragged_item and hasattr(self.dragged_item, 'course'):
-                    course = self.dragged_item.course
-                    if hasattr(course, 'semester') and hasattr(target, 'title'):
-                        compatible = is_compatible_semester(course.semester, target.title)
-                        
-                        # Highlight target accordingly - green if compatible, red if not
-                        if compatible:
-                            target.configure(background="#D5F5E3")  # Light green
-                        else:
-                            target.configure(background="#FADBD8")  # Light red
-                            
-                        print(f"Course {course.title} compatibility with {target.title}: {compatible}")
-                    else:
-                        # Default highlight if we can't determine compatibility
-                        target.configure(background="#CCE5FF")  # Light blue
-                else:
-                    # Default highlight
-                    target.configure(background="#CCE5FF")  # Light blue
-                    
-                break
+            bounds.append((x1, y1, x2, y2, target))
+        bounds.sort(key=lambda b: b[0])
+        self._target_bounds = bounds
+        self._target_lefts = [b[0] for b in bounds]
+    
+    def find_target(self, x, y):
+        """Return the drop target under the screen position, or None"""
+        if self._target_bounds is None:
+            self._build_target_geometry()
+        
+        # The targets don't overlap, so only the target with the nearest
+        # left edge at or before x can contain the point
+        i = bisect_right(self._target_lefts, x) - 1
+        if i < 0:
+            return None
+        x1, y1, x2, y2, target = self._target_bounds[i]
+        if x <= x2 and y1 <= y <= y2:
+            return target
+        return None
+    
+    def _highlight(self, target):
+        """Highlight the hovered target - green if the course fits, red if not"""
+        if target is None:
+            return
         
-        if old_target != self.target_container:
-            print(f"Target changed: {self.target_container}")
-            
-        return "break"  # Prevent further event processing
+        course = getattr(self.dragged_item, 'course', None)
+        if course is not None and hasattr(target, 'index'):
+            compatible = self.app.plan.can_assign(course, target.index)
+        elif course is not None and hasattr(target, 'title'):
+            compatible = is_compatible_semester(course.semester, target.title)
+        else:
+            # Default highlight if we can't determine compatibility
+            target.configure(background="#CCE5FF")  # Light blue
+            return
+        
+        if compatible:
+            target.configure(background="#D5F5E3")  # Light green
+        else:
+            target.configure(background="#FADBD8")  # Light red
+    
+    def _reset_highlight(self, target):
+        """Restore the original background of a target"""
+        if target is not None and target in self.original_colors:
+            target.configure(background=self.original_colors[target])
         
     def end_drag(self):
         """End dragging and process the drop"""
+        # Apply the last motion so the drop uses the final cursor position
+        if self._frame_job is not None:
+            self.app.root.after_cancel(self._frame_job)
+            self._frame_job = None
+        self._render_frame()
+        
         print(f"End drag, target: {self.target_container}")
         
-        # Reset highlights
-        for target in self.potential_targets:
-            if target in self.original_colors:
-                target.configure(background=self.original_colors[target])
+        # Reset highlight - only the hovered target is highlighted
+        self._reset_highlight(self.target_container)
                 
         if not self.dragging:
             if self.temp_window:
@@ -132,33 +192,26 @@ class DragDropManager:
         if self.dragged_item:
             course = self.dragged_item.course
             
-            # If the course was already in a semester, we'll always remove it first
-            if hasattr(course, 'assigned_semester') and course.assigned_semester:
-                try:
-                    current_semester = course.assigned_semester
-                    current_semester.remove_course(course)
-                    print(f"Removed {course.title} from {current_semester.title}")
-                except Exception as e:
-                    print(f"Error removing course: {e}")
+            plan = self.app.plan
             
-            # If dropped onto a valid target, add it to the new semester
+            # Check if course is compatible with the target semester
+            is_compatible = False
             if self.target_container:
-                # Check if course is compatible with this semester
-                is_compatible = True
-                if hasattr(course, 'semester') and hasattr(self.target_container, 'title'):
-                    is_compatible = is_compatible_semester(course.semester, self.target_container.title)
+                is_compatible = plan.can_assign(course, self.target_container.index)
+            
+            if is_compatible:
+                # Add the course to the target semester - the plan moves it
+                # out of its previous semester
+                self.target_container.add_course(course)
+                print(f"Added {course.title} to {self.target_container.title}")
+            else:
+                # An incompatible or missed drop removes the course from its semester
+                if plan.unassign(course):
+                    print(f"Course {course.title} was dragged away and removed from its semester (Ctrl+Z to undo)")
                 
-                # If compatible, proceed with drop
-                if is_compatible:
-                    # Add the course to the target semester
-                    self.target_container.add_course(course)
-                    print(f"Added {course.title} to {self.target_container.title}")
-                else:
+                if self.target_container:
                     messagebox.showwarning("Incompatible Semester", 
                                        f"This course ({course.title}) is only offered in {course.semester} semesters.")
-            else:
-                # If not dropped on a valid target, the course remains removed (dragged away)
-                print(f"Course {course.title} was dragged away and removed from its semester")
                     
         # Clean up
         if self.temp_window:
@@ -169,27 +222,3 @@ class DragDropManager:
         self.dragging = False
         self.dragged_item = None
         self.target_container = None
-
-# Add this helper function at the module level (outside any class)
-def is_compatible_semester(course_semester, target_semester_title):
-    """Check if a course can be placed in a given semester"""
-    # If course has no semester restriction, it can go anywhere
-    if not course_semester:
-        return True
-    
-    # Extract semester type from target title (e.g., "SoSe 2025" -> "SoSe")
-    target_semester_type = "SoSe" if "SoSe" in target_semester_title else "WiSe"
-    
-    # Check compatibility
-    if "SoSe/WiSe" in course_semester or "WiSe/SoSe" in course_semester:
-        # Course is offered in both semesters
-        return True
-    elif course_semester == "SoSe" and target_semester_type == "SoSe":
-        # Summer course in summer semester
-        return True
-    elif course_semester == "WiSe" and target_semester_type == "WiSe":
-        # Winter course in winter semester
-        return True
-    else:
-        # Incompatible
-        return False
\ No newline at end of file
@@ -0,0 +1,184 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from models.plan import Plan, course_identifier
+from models.plan_compare import PlanComparison, load_slot_plan
+
+# Text colors of the courses that differ from the reference plan
+ADDED_COLOR = "#2e7d32"
+MOVED_COLOR = "#1565c0"
+REMOVED_COLOR = "#c62828"
+
+
+def _signed(value):
+    return f"+{value}" if value > 0 else str(value)
+
+
+class PlanCompareWindow(tk.Toplevel):
+    """Side-by-side comparison of save slots.
+
+    The chosen slots are loaded into headless plans on every compare and
+    diffed against a reference slot; the live semester frames are not
+    touched.
+    The current slot is compared as it is on screen, including changes
+    that are not saved yet.
+    """
+
+    def __init__(self, parent, app):
+        super().__init__(parent)
+        self.app = app
+        self.title("Compare Save Slots")
+        self.geometry("1200x700")
+
+        self.comparison = PlanComparison(app.courses)
+        # Courses by the identifier they are saved under, shared with the app
+        self.course_by_code = app.course_by_code
+        self.columns = []  # Widgets of the slot columns, rebuilt by compare()
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        """Create the UI elements"""
+        controls = ttk.Frame(self)
+        controls.pack(fill=tk.X, padx=10, pady=10)
+
+        # Slots to compare
+        ttk.Label(controls, text="Slots:").pack(side=tk.LEFT, anchor=tk.N)
+        self.slot_listbox = tk.Listbox(controls, selectmode=tk.MULTIPLE, exportselection=False,
+                                       height=min(6, max(len(self.app.available_slots), 1)))
+        for slot in self.app.available_slots:
+            self.slot_listbox.insert(tk.END, slot)
+        self.slot_listbox.pack(side=tk.LEFT, padx=5)
+        if self.app.current_slot in self.app.available_slots:
+            self.slot_listbox.selection_set(self.app.available_slots.index(self.app.current_slot))
+
+        # Slot the others are compared against
+        ttk.Label(controls, text="Reference:").pack(side=tk.LEFT, anchor=tk.N, padx=(10, 0))
+        self.reference_var = tk.StringVar(value=self.app.current_slot)
+        ttk.Combobox(controls, textvariable=self.reference_var, values=self.app.available_slots,
+                     state="readonly", width=25).pack(side=tk.LEFT, anchor=tk.N, padx=5)
+
+        ttk.Button(controls, text="Compare", command=self.compare).pack(side=tk.LEFT, anchor=tk.N, padx=5)
+
+        # One column per slot, side by side
+        self.columns_frame = ttk.Frame(self)
+        self.columns_frame.pack(fill=tk.BOTH, expand=True, padx=10)
+
+        # Credits per requirement bucket, one column per slot
+        self.bucket_tree = ttk.Treeview(self, show="headings", height=len(self.app.plan.rules.buckets))
+        self.bucket_tree.pack(fill=tk.X, padx=10, pady=10)
+
+    def _plan(self, slot):
+        """Headless plan of a slot, read from disk again on every compare so
+        slots saved since the last one are not shown stale"""
+        if slot == self.app.current_slot:
+            # Copy the live plan so later edits do not change the comparison
+            live = self.app.plan
+            plan = Plan([semester.title for semester in live.semesters], live.semesters[0].max_lp, live.rules)
+            plan.load_assignments(live.to_assignments(), self.course_by_code)
+            return plan
+        return load_slot_plan(self.app.plan_store, slot, self.course_by_code, self.app.plan.rules,
+                              [semester.title for semester in self.app.plan.semesters])
+
+    def compare(self):
+        """Load the selected slots and show their differences to the reference"""
+        reference = self.reference_var.get()
+        slots = [self.slot_listbox.get(i) for i in self.slot_listbox.curselection()]
+        # The reference always comes first
+        slots = [reference] + [slot for slot in slots if slot != reference]
+
+        for slot in slots:
+            try:
+                self.comparison.add(slot, self._plan(slot))
+            except (OSError, ValueError, KeyError, AttributeError, TypeError) as e:
+                print(f"Error loading save slot '{slot}' for comparison: {e}")
+                messagebox.showerror("Error", f"Failed to load save slot '{slot}': {e}", parent=self)
+                return
+
+        diffs = {slot: self.comparison.diff(reference, slot) for slot in slots[1:]}
+
+        # Columns of slots no longer compared must not keep their space
+        for i, column in enumerate(self.columns):
+            column.destroy()
+            self.columns_frame.columnconfigure(i, weight=0, uniform="")
+        self.columns = []
+        for i, slot in enumerate(slots):
+            self.columns_frame.columnconfigure(i, weight=1, uniform="slot")
+            column = self._create_column(slot, diffs.get(slot), reference)
+            column.grid(row=0, column=i, sticky="nsew", padx=2)
+            self.columns.append(column)
+        self.columns_frame.rowconfigure(0, weight=1)
+
+        self._update_bucket_tree(slots, diffs)
+
+    def _create_column(self, slot, diff, reference):
+        """Frame listing a slot's semesters, with its changes to the reference highlighted"""
+        plan = self.comparison.plans[slot]
+        frame = ttk.LabelFrame(self.columns_frame, text=slot)
+        text = tk.Text(frame, wrap=tk.WORD, width=30, font=("Helvetica", 10), relief=tk.FLAT)
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=text.yview)
+        text.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        text.pack(fill=tk.BOTH, expand=True)
+
+        text.tag_configure("heading", font=("Helvetica", 10, "bold"))
+        text.tag_configure("added", foreground=ADDED_COLOR)
+        text.tag_configure("moved", foreground=MOVED_COLOR)
+        text.tag_configure("removed", foreground=REMOVED_COLOR, overstrike=True)
+
+        added = set(diff.added) if diff else set()
+        moved = {identifier: old_index for identifier, old_index, _ in diff.moved} if diff else {}
+
+        if diff is None:
+            summary = "reference"
+        elif self.comparison.is_identical(reference, slot):
+            summary = "same courses as the reference"
+        else:
+            summary = f"{len(diff.added)} added, {len(diff.removed)} removed, {len(diff.moved)} moved"
+        text.insert(tk.END, f"{plan.total_credits()} LP, {plan.requirement_completion():.0f}% of requirements\n"
+                            f"{summary}\n\n")
+
+        for index, semester in enumerate(plan.semesters):
+            delta = f", {_signed(diff.semester_delta[index])}" if diff and diff.semester_delta[index] else ""
+            text.insert(tk.END, f"{semester.title} ({semester.total_lp} LP{delta})\n", "heading")
+            for course in semester.courses:
+                identifier = course_identifier(course)
+                line = f"  {course.title} ({course.credits} LP)"
+                if identifier in added:
+                    text.insert(tk.END, f"{line}  new\n", "added")
+                elif identifier in moved:
+                    old_title = plan.semesters[moved[identifier]].title
+                    text.insert(tk.END, f"{line}  from {old_title}\n", "moved")
+                else:
+                    text.insert(tk.END, f"{line}\n")
+            text.insert(tk.END, "\n")
+
+        if diff and diff.removed:
+            text.insert(tk.END, "Not in this plan\n", "heading")
+            for identifier in diff.removed:
+                course = self.course_by_code.get(identifier)
+                title = course.title if course else identifier
+                text.insert(tk.END, f"  {title}\n", "removed")
+
+        text.configure(state=tk.DISABLED)
+        return frame
+
+    def _update_bucket_tree(self, slots, diffs):
+        """Show the credits per requirement bucket and their change to the reference"""
+        tree = self.bucket_tree
+        tree.delete(*tree.get_children())
+        columns = ["requirement"] + [f"slot{i}" for i in range(len(slots))]
+        tree.configure(columns=columns)
+        tree.heading("requirement", text="Requirement")
+        tree.column("requirement", width=250, stretch=False)
+        for column, slot in zip(columns[1:], slots):
+            tree.heading(column, text=slot)
+            tree.column(column, width=120, anchor=tk.CENTER)
+
+        for node in self.app.plan.rules.buckets:
+            values = [node.key]
+            for slot in slots:
+                credits = self.comparison.plans[slot].requirements.credits_per_bucket[node.key]
+                delta = diffs[slot].bucket_delta[node.key] if slot in diffs else 0
+                values.append(f"{credits}/{node.total} ({_signed(delta)})" if delta else f"{credits}/{node.total}")
+            tree.insert("", tk.END, values=values)
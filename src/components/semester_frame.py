@@ -2,17 +2,30 @@ import tkinter as tk
 from tkinter import messagebox
 from tkinter import ttk
 from components.course_block import CourseBlock
+from components.canvas_blocks import CanvasBlockRenderer, CanvasCourseBlock
+from models.plan import Plan
 
 class SemesterFrame(tk.Frame):
-    def __init__(self, parent, title, max_credits=30, drag_drop_manager=None):
+    # Vertical space between drawn course blocks (canvas backend)
+    BLOCK_SPACING = 6
+    
+    def __init__(self, parent, title, max_credits=30, drag_drop_manager=None, plan=None, index=0,
+                 render_backend="widgets"):
         # Reduce padding to save space
         super().__init__(parent, padx=5, pady=10, relief=tk.RAISED, borderwidth=2)  # Reduced padx from 10 to 5
         self.title = title
         self.max_credits = max_credits
-        self.courses = []
-        self.total_credits = 0
         self.drag_drop_manager = drag_drop_manager
         self.course_blocks = {}  # Keep track of course blocks
+        self._scroll_pending = False  # Scroll to the newest course on the next refresh
+        
+        # The plan owns the assignments - this frame only displays its semester
+        if plan is None:
+            plan = Plan([title], max_credits)
+        self.plan = plan
+        self.index = index
+        self.semester = plan.semesters[index]
+        self.plan.subscribe(self.on_plan_changed)
         
         # Register as a drop target
         if self.drag_drop_manager:
@@ -46,15 +59,22 @@ class SemesterFrame(tk.Frame):
         
         # Create a frame to hold the courses
         self.course_container = ttk.Frame(self.canvas)
+        self.block_width = canvas_width - 4
         
-        # Add the course container to the canvas
-        self.canvas_window = self.canvas.create_window(
-            (0, 0),
-            window=self.course_container,
-            anchor="nw",
-            width=canvas_width-4,
-            tags="course_container"
-        )
+        # The canvas backend draws the course blocks on the canvas itself,
+        # the widget backend packs them into the course container
+        self.renderer = None
+        if render_backend == "canvas":
+            self.renderer = CanvasBlockRenderer(self.canvas, self.drag_drop_manager)
+        else:
+            # Add the course container to the canvas
+            self.canvas_window = self.canvas.create_window(
+                (0, 0),
+                window=self.course_container,
+                anchor="nw",
+                width=canvas_width-4,
+                tags="course_container"
+            )
         
         # Configure resize handling
         self.canvas.bind("<Configure>", self._configure_canvas)
@@ -65,6 +85,15 @@ class SemesterFrame(tk.Frame):
         
         # Set initial scroll region to make scrollbar appear
         self._setup_initial_scroll_region()
+    
+    @property
+    def courses(self):
+        """Courses assigned to this semester"""
+        return self.semester.courses
+    
+    @property
+    def total_credits(self):
+        return self.semester.total_lp
 
     def _setup_initial_scroll_region(self):
         """Set up an initial scroll region to make scrollbar always visible"""
@@ -120,6 +149,11 @@ class SemesterFrame(tk.Frame):
         """Update the canvas when it's resized"""
         # Update the width of the window inside the canvas
         self.canvas.itemconfig("course_container", width=event.width)
+        
+        if self.renderer and event.width - 4 != self.block_width:
+            self.block_width = event.width - 4
+            for block in self.course_blocks.values():
+                block.set_width(self.block_width)
 
     def _configure_scroll_region(self, event=None):
         """Update the scroll region when the content changes"""
@@ -138,24 +172,39 @@ class SemesterFrame(tk.Frame):
     def add_course(self, course):
         """Add a course to this semester"""
         # Check semester compatibility
-        if hasattr(course, 'semester') and course.semester:
-            from components.drag_drop_manager import is_compatible_semester
-            if not is_compatible_semester(course.semester, self.title):
-                messagebox.showwarning("Incompatible Semester", 
-                                   f"This course ({course.title}) is only offered in {course.semester} semesters.")
-                return False
-        
-        # If the course is already in a semester, remove it
-        if hasattr(course, 'assigned_semester') and course.assigned_semester is not None:
-            try:
-                print(f"Removing course {course.title} from previous semester")
-                course.assigned_semester.remove_course(course)
-            except Exception as e:
-                print(f"Error removing course: {e}")
-        
-        # Add the course to this semester
-        self.courses.append(course)
-        course.assigned_semester = self
+        if not self.plan.can_assign(course, self.index):
+            messagebox.showwarning("Incompatible Semester", 
+                               f"This course ({course.title}) is only offered in {course.semester} semesters.")
+            return False
+        
+        # The plan moves the course out of its previous semester if needed;
+        # the display is updated from on_plan_changed
+        return self.plan.assign(course, self.index)
+
+    def remove_course(self, course):
+        """Remove a course from this semester"""
+        if self.plan.semester_index(course) == self.index:
+            return self.plan.unassign(course)
+        return False
+    
+    def on_plan_changed(self, event):
+        """Update the displayed courses when the plan changes"""
+        if event.old_index == self.index:
+            self._remove_course_block(event.course)
+        if event.new_index == self.index:
+            self._add_course_block(event.course)
+    
+    def _add_course_block(self, course):
+        """Show a block for a course that was assigned to this semester"""
+        if self.renderer:
+            # Draw the block below the last one; the canvas already handles
+            # mousewheel events for everything drawn on it
+            self.course_blocks[course] = CanvasCourseBlock(
+                self.renderer, course, 2, self._next_block_y(), self.block_width
+            )
+            self._scroll_pending = True
+            self._request_refresh()
+            return
         
         # Create a visual block for the course
         course_block = CourseBlock(self.course_container, course, self.drag_drop_manager)
@@ -186,54 +235,61 @@ class SemesterFrame(tk.Frame):
             child.bind("<Button-4>", _on_mousewheel)
             child.bind("<Button-5>", _on_mousewheel)
         
+        # Credits and scrolling are refreshed once for all changes in this tick
+        self._scroll_pending = True
+        self._request_refresh()
+    
+    def _remove_course_block(self, course):
+        """Remove the block of a course that left this semester"""
+        # Remove the corresponding visual block
+        if course in self.course_blocks:
+            self.course_blocks[course].destroy()
+            del self.course_blocks[course]
+            
+            if self.renderer:
+                self._layout_blocks()
+            
+        self._request_refresh()
+    
+    def _next_block_y(self):
+        """Top y position for a new drawn block"""
+        y = self.BLOCK_SPACING // 2
+        for block in self.course_blocks.values():
+            y = max(y, block.y + block.height + self.BLOCK_SPACING)
+        return y
+    
+    def _layout_blocks(self):
+        """Stack the drawn blocks again after one was removed"""
+        y = self.BLOCK_SPACING // 2
+        for block in self.course_blocks.values():
+            if block.y != y:
+                block.move_to(block.x, y)
+            y += block.height + self.BLOCK_SPACING
+    
+    def _request_refresh(self):
+        """Ask the app for a coalesced layout refresh, or refresh right away without an app"""
+        app = getattr(self.drag_drop_manager, 'app', None)
+        if app is not None and hasattr(app, 'schedule_refresh'):
+            app.schedule_refresh(self)
+        else:
+            self.refresh_layout()
+    
+    def refresh_layout(self):
+        """Update the credits display and scroll region after courses changed"""
         # Update the total credits display
         self.update_total_credits()
         
-        # Force update of the scroll region to include the new course
+        # Force update of the scroll region to include the new courses
         self.course_container.update_idletasks()
         self._configure_scroll_region()
         
         # Use after_idle to make sure the scroll happens after everything is updated
-        self.after_idle(self.scroll_to_bottom)
-        
-        # Update the course list to gray out this course
-        if self.drag_drop_manager and hasattr(self.drag_drop_manager, 'app') and hasattr(self.drag_drop_manager.app, 'course_list'):
-            self.drag_drop_manager.app.course_list.display_courses()
-        
-        # Update graduation requirements
-        if self.drag_drop_manager and hasattr(self.drag_drop_manager, 'app'):
-            self.drag_drop_manager.app.update_graduation_requirements()
-        
-        return True  # Successfully added
-
-    def remove_course(self, course):
-        """Remove a course from this semester"""
-        if course in self.courses:
-            self.courses.remove(course)
-            course.assigned_semester = None
-            
-            # Remove the corresponding visual block
-            if course in self.course_blocks:
-                self.course_blocks[course].destroy()
-                del self.course_blocks[course]
-                
-            # Update the total credits display
-            self.update_total_credits()
-            
-            # Update the course list to un-gray this course
-            if self.drag_drop_manager and hasattr(self.drag_drop_manager, 'app') and hasattr(self.drag_drop_manager.app, 'course_list'):
-                self.drag_drop_manager.app.course_list.display_courses()
-            
-            # Update graduation requirements
-            if self.drag_drop_manager and hasattr(self.drag_drop_manager, 'app'):
-                self.drag_drop_manager.app.update_graduation_requirements()
-                
-            return True
-        return False
+        if self._scroll_pending:
+            self._scroll_pending = False
+            self.after_idle(self.scroll_to_bottom)
 
     def update_total_credits(self):
         """Update the total credits display"""
-        self.total_credits = sum(course.credits for course in self.courses)
         self.credits_label.config(text=f"Credits: {self.total_credits}/{self.max_credits} LP")
         
         # Change color if over credit limit
@@ -0,0 +1,206 @@
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+
+
+def atomic_write(path, write, binary=False):
+    """Write a file so that path always holds either the old or the new content.
+
+    write(f) fills a temporary file in the same directory, which is then
+    flushed to disk and renamed over the target. Every call uses its own
+    temporary file, so concurrent writers (the Tk thread and the autosave
+    thread, or two app instances) cannot clobber each other.
+    """
+    directory = os.path.dirname(path) or "."
+    fd, temp_file = tempfile.mkstemp(dir=directory, prefix=f"{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with open(fd, 'wb' if binary else 'w', encoding=None if binary else 'utf-8') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, path)
+    except BaseException:
+        try:
+            os.remove(temp_file)
+        except OSError:
+            pass
+        raise
+
+    # Persist the rename itself (not supported on every platform)
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+def atomic_write_json(path, data):
+    """Write data as JSON with atomic_write()"""
+    atomic_write(path, lambda f: json.dump(data, f, indent=2, ensure_ascii=False))
+
+
+class AutoSaver:
+    """Debounced saving with the file writes done on a background thread.
+
+    mark_dirty() (re)starts a short timer; when it fires, snapshot() is
+    called on the Tk thread and must return a list of (path, state) pairs
+    with state being plain JSON data. The worker thread writes the latest
+    snapshot per path
+    with atomic_write_json. on_status(text) is called on the Tk thread
+    whenever the save status changes, on_error(path, error) when a write
+    failed.
+    """
+
+    # How often the Tk thread checks for finished writes
+    POLL_MS = 100
+
+    def __init__(self, root, snapshot, on_status=None, on_error=None, delay_ms=1000):
+        self.root = root
+        self.snapshot = snapshot
+        self.on_status = on_status
+        self.on_error = on_error
+        self.delay_ms = delay_ms
+
+        self.dirty = False
+        self.pending_writes = 0  # Snapshots handed to the worker but not written yet
+        self.last_saved = None  # time.time() of the last successful write
+        self.last_error = None
+        self._save_job = None
+        self._poll_job = None
+
+        self._requests = queue.Queue()  # (path, state) snapshots for the worker
+        self._results = queue.Queue()  # (path, error or None) from the worker
+        self._worker = threading.Thread(target=self._run_worker, name="autosave", daemon=True)
+        self._worker.start()
+
+    def mark_dirty(self):
+        """Note a change and save once no further change came in for delay_ms"""
+        self.dirty = True
+        if self._save_job is not None:
+            self.root.after_cancel(self._save_job)
+        self._save_job = self.root.after(self.delay_ms, self.save_now)
+        self._report_status()
+
+    def mark_clean(self):
+        """Forget unsaved changes, e.g. right after loading a file"""
+        self._cancel_timer()
+        self.dirty = False
+        self._report_status()
+
+    def save_now(self, wait=False):
+        """Snapshot the state and hand it to the worker.
+
+        With wait=True, block until the file is written - used where the
+        file is needed right away (copying a slot, closing the app).
+        """
+        self._cancel_timer()
+        self.dirty = False
+
+        files = self.snapshot()
+        for path, state in files:
+            self.pending_writes += 1
+            self._requests.put((path, state))
+        self._report_status()
+
+        if wait:
+            self._requests.join()
+            self._collect_results()
+        elif self._poll_job is None:
+            self._poll_job = self.root.after(self.POLL_MS, self._poll_results)
+
+    def flush(self):
+        """Write pending changes now and wait until all writes are done"""
+        if self.dirty:
+            self.save_now(wait=True)
+        else:
+            self._requests.join()
+            self._collect_results()
+
+    def status_text(self):
+        """Short save status for the title bar"""
+        if self.pending_writes:
+            return "saving..."
+        if self.dirty:
+            return "unsaved changes"
+        if self.last_error is not None:
+            return "save failed"
+        if self.last_saved is not None:
+            return f"saved {time.strftime('%H:%M:%S', time.localtime(self.last_saved))}"
+        return ""
+
+    def _cancel_timer(self):
+        if self._save_job is not None:
+            self.root.after_cancel(self._save_job)
+            self._save_job = None
+
+    def _report_status(self):
+        if self.on_status:
+            self.on_status(self.status_text())
+
+    def _run_worker(self):
+        """Write snapshots until the process exits"""
+        while True:
+            path, state = self._requests.get()
+
+            # Only the newest snapshot of a file needs to be written
+            latest = {path: state}
+            received = 1
+            while True:
+                try:
+                    path, state = self._requests.get_nowait()
+                except queue.Empty:
+                    break
+                latest[path] = state
+                received += 1
+
+            for path, state in latest.items():
+                try:
+                    atomic_write_json(path, state)
+                    self._results.put((path, None))
+                except Exception as e:
+                    self._results.put((path, e))
+
+            # Superseded snapshots count as done
+            for _ in range(received - len(latest)):
+                self._results.put((None, None))
+            for _ in range(received):
+                self._requests.task_done()
+
+    def _collect_results(self):
+        """Apply the worker's results on the Tk thread"""
+        changed = False
+        while True:
+            try:
+                path, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            changed = True
+            self.pending_writes -= 1
+            if path is None:
+                continue
+            if error is None:
+                self.last_saved = time.time()
+                self.last_error = None
+                print(f"State saved to {path}")
+            else:
+                self.last_error = error
+                print(f"Error saving state: {error}")
+                if self.on_error:
+                    self.on_error(path, error)
+        if changed:
+            self._report_status()
+        return changed
+
+    def _poll_results(self):
+        self._poll_job = None
+        self._collect_results()
+        if self.pending_writes:
+            self._poll_job = self.root.after(self.POLL_MS, self._poll_results)
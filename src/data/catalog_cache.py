@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+import pickle
+
+from data.autosave import atomic_write
+from models.course import Course
+
+# Bump when the cached row layout changes so old caches are rebuilt
+CACHE_FORMAT_VERSION = 1
+
+# Course fields stored per row, in Course.__init__ argument order
+COURSE_FIELDS = ("title", "credits", "description", "module_code", "group", "semester", "exam_type", "grading")
+
+
+def course_rows_from_json(courses_data):
+    """Convert the entries of courses.json into field tuples"""
+    rows = []
+    for course_data in courses_data:
+        # Check if the course has a title - if not, it's a placeholder entry
+        if 'title' not in course_data:
+            continue
+        rows.append((
+            course_data.get('title', 'Unnamed Course'),
+            course_data.get('credits', 0),
+            course_data.get('description', ''),
+            course_data.get('module_code', ''),
+            course_data.get('group', ''),
+            course_data.get('semester', ''),
+            course_data.get('exam_type', ''),
+            course_data.get('grading', ''),
+        ))
+    return rows
+
+
+def _read_cache(cache_file):
+    """Return the cached catalog dict, or None if missing or unusable"""
+    try:
+        with open(cache_file, 'rb') as f:
+            cached = pickle.load(f)
+    except (OSError, pickle.PickleError, EOFError, AttributeError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("version") != CACHE_FORMAT_VERSION:
+        return None
+    return cached
+
+
+def _write_cache(cache_file, cached):
+    """Write the cache through a temporary file so it is never half-written"""
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        atomic_write(cache_file, lambda f: pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL), binary=True)
+    except OSError as e:
+        print(f"Error writing course cache: {e}")
+
+
+def load_course_catalog(courses_file, cache_file):
+    """Load the courses of courses_file, using a compiled cache when possible.
+
+    The cache is keyed by the JSON file's mtime and size; if those changed,
+    the file's SHA-256 hash decides whether the cached rows are still valid.
+    Returns (courses, source) where source is "cache" or "json".
+    """
+    stat = os.stat(courses_file)
+    cached = _read_cache(cache_file)
+
+    if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+        source = "cache"
+    else:
+        with open(courses_file, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+
+        if cached and cached["sha256"] == digest:
+            # File was touched but not changed - only refresh the key
+            source = "cache"
+            rows = cached["rows"]
+        else:
+            source = "json"
+            rows = course_rows_from_json(json.loads(raw.decode('utf-8')))
+
+        cached = {
+            "version": CACHE_FORMAT_VERSION,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": digest,
+            "rows": rows,
+        }
+        _write_cache(cache_file, cached)
+
+    return [Course(*row) for row in cached["rows"]], source
@@ -0,0 +1,103 @@
+import json
+import os
+
+
+class Journal:
+    """Append-only log of changes, one JSON object per line.
+
+    Every append is flushed and fsynced, so a crash loses at most the
+    event being written. A torn last line left by such a crash is cut off
+    by read_events() before anything new is appended.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.event_count = 0
+        self._file = None
+
+    def read_events(self, repair=True):
+        """All complete events in the journal, oldest first.
+
+        repair=False leaves a torn last line in place (for read-only tools).
+        """
+        self.close()
+        events = []
+        valid_size = 0
+        try:
+            with open(self.path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        break
+                    valid_size += len(line)
+                size = f.seek(0, os.SEEK_END)
+        except OSError:
+            self.event_count = 0
+            return events
+
+        if size != valid_size and repair:
+            print(f"Dropping incomplete journal entry in {self.path}")
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_size)
+        self.event_count = len(events)
+        return events
+
+    def append(self, event):
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(event, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.event_count += 1
+
+    def reset(self):
+        """Delete the journal after its events went into a snapshot"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self.event_count = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def apply_plan_events(assignments, events):
+    """Semester assignments ({"0": [codes], ...}) with assign/unassign events applied"""
+    assignments = {semester_idx: list(codes) for semester_idx, codes in assignments.items()}
+    for event in events:
+        op = event.get("op")
+        if op not in ("assign", "unassign"):
+            continue
+        code = event["code"]
+        for codes in assignments.values():
+            if code in codes:
+                codes.remove(code)
+        if op == "assign":
+            assignments.setdefault(str(event["semester"]), []).append(code)
+    return assignments
+
+
+def apply_ui_events(ui_state, events):
+    """Shared UI state with favorite and expand/collapse events applied"""
+    ui_state = dict(ui_state)
+    favorites = list(ui_state.get("favorites", []))
+    expanded_groups = dict(ui_state.get("expanded_groups", {}))
+    for event in events:
+        op = event.get("op")
+        if op == "favorite":
+            if event["value"] and event["code"] not in favorites:
+                favorites.append(event["code"])
+            elif not event["value"] and event["code"] in favorites:
+                favorites.remove(event["code"])
+        elif op == "expand":
+            expanded_groups[event["group"]] = event["value"]
+    ui_state["favorites"] = favorites
+    ui_state["expanded_groups"] = expanded_groups
+    return ui_state
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+
+from data.autosave import atomic_write_json
+
+# Slot files written by PlanStore carry this version; files without it are
+# the old format with favorites and UI state in every slot
+PLAN_FORMAT_VERSION = 2
+
+# Frozen plans that copied slots are stored against, inside the save directory
+BASES_DIR = "bases"
+
+
+def assignments_hash(assignments):
+    """Content hash of semester assignments"""
+    data = json.dumps(assignments, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def assignment_delta(base, assignments):
+    """Per-semester course codes added to and removed from base"""
+    delta = {"add": {}, "remove": {}}
+    for semester_idx in sorted(set(base) | set(assignments), key=int):
+        old_codes = base.get(semester_idx, [])
+        new_codes = assignments.get(semester_idx, [])
+        old_set, new_set = set(old_codes), set(new_codes)
+        added = [code for code in new_codes if code not in old_set]
+        removed = [code for code in old_codes if code not in new_set]
+        if added:
+            delta["add"][semester_idx] = added
+        if removed:
+            delta["remove"][semester_idx] = removed
+    return delta
+
+
+def apply_delta(base, delta):
+    """Semester assignments of base with a delta from assignment_delta applied"""
+    assignments = {}
+    added, removed = delta.get("add", {}), delta.get("remove", {})
+    for semester_idx in sorted(set(base) | set(added), key=int):
+        removed_codes = set(removed.get(semester_idx, ()))
+        codes = [code for code in base.get(semester_idx, []) if code not in removed_codes]
+        assignments[semester_idx] = codes + added.get(semester_idx, [])
+    return assignments
+
+
+def _code_count(assignments):
+    return sum(len(codes) for codes in assignments.values())
+
+
+class PlanStore:
+    """Reads and writes the per-slot plan files.
+
+    A slot file holds only semester assignments. Copied slots point to a
+    frozen base plan (the parent slot at the time of the copy, stored once
+    under bases/ by content hash) and store the courses added and removed
+    since then, so many variants of one plan cost little more than their
+    differences. Favorites, expanded groups and the window size are shared
+    by all slots and live in the UI state file.
+    """
+
+    def __init__(self, save_dir, ui_state_file):
+        self.save_dir = save_dir
+        self.bases_dir = os.path.join(save_dir, BASES_DIR)
+        self.ui_state_file = ui_state_file
+        self._bases = {}  # Base hash -> assignments; bases never change
+
+    def slot_file(self, slot):
+        return os.path.join(self.save_dir, f"{slot}.json")
+
+    def journal_file(self, slot):
+        return os.path.join(self.save_dir, f"{slot}.journal")
+
+    def read_slot(self, slot):
+        """Raw content of a slot file"""
+        with open(self.slot_file(slot), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def base_of(self, data):
+        """Base hash a slot file's content is stored against, or None"""
+        return data.get("base") if data.get("format") == PLAN_FORMAT_VERSION else None
+
+    def load_base(self, base):
+        try:
+            return self._bases[base]
+        except KeyError:
+            pass
+        with open(os.path.join(self.bases_dir, f"{base}.json"), 'r', encoding='utf-8') as f:
+            assignments = json.load(f)
+        self._bases[base] = assignments
+        return assignments
+
+    def assignments_of(self, data):
+        """Full semester assignments of a slot file's content (either format)"""
+        base = self.base_of(data)
+        if base is None:
+            return data.get("semester_assignments", {})
+        return apply_delta(self.load_base(base), data)
+
+    def load_assignments(self, slot):
+        return self.assignments_of(self.read_slot(slot))
+
+    def encode(self, assignments, base=None, parent=None):
+        """Slot file content for assignments, stored as a delta against base
+        as long as that is smaller than storing the plan in full"""
+        if base is not None:
+            try:
+                delta = assignment_delta(self.load_base(base), assignments)
+            except (OSError, ValueError) as e:
+                print(f"Error reading base plan {base}: {e}")
+            else:
+                if _code_count(delta["add"]) + _code_count(delta["remove"]) < _code_count(assignments):
+                    data = {"format": PLAN_FORMAT_VERSION, "base": base}
+                    if parent:
+                        data["parent"] = parent
+                    data.update(delta)
+                    return data
+        return {"format": PLAN_FORMAT_VERSION, "semester_assignments": assignments}
+
+    def freeze_base(self, assignments):
+        """Store assignments as a base plan and return its hash"""
+        base = assignments_hash(assignments)
+        path = os.path.join(self.bases_dir, f"{base}.json")
+        if not os.path.exists(path):
+            os.makedirs(self.bases_dir, exist_ok=True)
+            atomic_write_json(path, assignments)
+        self._bases[base] = assignments
+        return base
+
+    def collect_bases(self, used_bases):
+        """Delete the base plans no slot refers to any more"""
+        try:
+            filenames = os.listdir(self.bases_dir)
+        except OSError:
+            return
+        for filename in filenames:
+            base = filename[:-5]  # Remove .json extension
+            if filename.endswith(".json") and base not in used_bases:
+                try:
+                    os.remove(os.path.join(self.bases_dir, filename))
+                    self._bases.pop(base, None)
+                except OSError as e:
+                    print(f"Error deleting base plan: {e}")
+
+    def load_ui_state(self):
+        """Shared favorites, expanded groups and window size, or None if not saved yet"""
+        try:
+            with open(self.ui_state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
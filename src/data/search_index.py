@@ -0,0 +1,100 @@
+import unicodedata
+
+# German umlauts are folded to their two-letter spelling so that "Prüfung",
+# "Pruefung" and a query typed as "prue" all match each other
+UMLAUT_FOLDING = str.maketrans({
+    "ä": "ae",
+    "ö": "oe",
+    "ü": "ue",
+    "ß": "ss",
+})
+
+NGRAM_SIZE = 3
+
+
+def normalize_text(text):
+    """Lowercase text, fold umlauts and strip any remaining accents"""
+    if not text:
+        return ""
+    text = text.lower().translate(UMLAUT_FOLDING)
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def ngrams(text, size=NGRAM_SIZE):
+    """Return the set of character n-grams of a text"""
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class CourseSearchIndex:
+    """Precomputed search data for the course list filter.
+
+    Every course's title, description, module code and group are normalized
+    once and stored in a trigram inverted index, so a search only verifies
+    the courses that contain all trigrams of the query.
+    """
+
+    # Fields that are searched, same as the course list filter
+    SEARCH_FIELDS = ("title", "description", "module_code", "group")
+
+    def __init__(self, courses):
+        self.courses = list(courses)
+        self.haystacks = []  # Normalized searchable text per course
+        self.postings = {}  # Trigram -> set of course indices
+
+        # Remember the last search so that typing one more character only
+        # has to narrow down the previous result
+        self._last_query = None
+        self._last_result = None
+
+        for index, course in enumerate(self.courses):
+            fields = [normalize_text(getattr(course, field, "") or "") for field in self.SEARCH_FIELDS]
+            # Join with a newline so that matches never span two fields
+            self.haystacks.append("\n".join(fields))
+            for field in fields:
+                for gram in ngrams(field):
+                    self.postings.setdefault(gram, set()).add(index)
+
+    def search(self, query):
+        """Return the courses matching the query, in catalog order"""
+        return [self.courses[index] for index in self.search_indices(query)]
+
+    def search_indices(self, query):
+        """Return the sorted indices of the courses matching the query"""
+        query = normalize_text(query)
+        if not query:
+            return list(range(len(self.courses)))
+
+        if self._last_query and query.startswith(self._last_query):
+            # The query only grew, so the result is a subset of the last one
+            candidates = self._last_result
+            if len(query) >= NGRAM_SIZE:
+                candidates = candidates & self.postings.get(query[-NGRAM_SIZE:], set())
+        elif len(query) >= NGRAM_SIZE:
+            candidates = self._candidates(query)
+        else:
+            # Too short for the trigram index, check every course
+            candidates = range(len(self.courses))
+
+        result = {index for index in candidates if query in self.haystacks[index]}
+        self._last_query = query
+        self._last_result = result
+        return sorted(result)
+
+    def _candidates(self, query):
+        """Intersect the posting lists of all trigrams of the query"""
+        postings = []
+        for gram in ngrams(query):
+            posting = self.postings.get(gram)
+            if not posting:
+                return set()
+            postings.append(posting)
+
+        # Start with the rarest trigram to keep the intersections small
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                break
+        return candidates
@@ -0,0 +1,45 @@
+from collections import OrderedDict, namedtuple
+
+from utils.constants import SLOT_CACHE_SIZE
+
+# Parsed state of a slot: its full semester assignments (journal applied),
+# the base plan and parent slot it is saved against, and the number of
+# events in its journal file
+CachedSlot = namedtuple("CachedSlot", ["assignments", "base", "parent", "journal_events"])
+
+
+class SlotCache:
+    """Recently used save slots, kept parsed so switching back to them
+    does not read any files.
+
+    The current slot is taken out of the cache while it is open and put
+    back with its latest state when another slot is opened, so entries
+    never go stale through edits in the app. The least recently used
+    entry is dropped once more than `capacity` slots are cached.
+    """
+
+    def __init__(self, capacity=SLOT_CACHE_SIZE):
+        self.capacity = capacity
+        self._slots = OrderedDict()
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, slot):
+        return slot in self._slots
+
+    def put(self, slot, entry):
+        self._slots[slot] = entry
+        self._slots.move_to_end(slot)
+        while len(self._slots) > self.capacity:
+            self._slots.popitem(last=False)
+
+    def take(self, slot):
+        """Remove and return a slot's entry, or None if it is not cached"""
+        return self._slots.pop(slot, None)
+
+    def discard(self, slot):
+        self._slots.pop(slot, None)
+
+    def clear(self):
+        self._slots.clear()
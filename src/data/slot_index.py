@@ -0,0 +1,152 @@
+import json
+import os
+
+from data.autosave import atomic_write_json
+from data.plan_store import assignments_hash
+from models.plan import Plan
+
+# Index of the save slots, stored next to the slot files
+SLOT_INDEX_FILE = "slots.index"
+
+# Bump when the metadata layout changes so old indexes are rebuilt
+INDEX_FORMAT_VERSION = 2
+
+
+def slot_metadata(plan, mtime, base=None):
+    """Summary of a saved plan for the slot picker.
+
+    base is the base plan the slot file is stored against, if any.
+    """
+    return {
+        "total_lp": plan.total_credits(),
+        "semester_lp": [semester.total_lp for semester in plan.semesters],
+        "requirements_percent": round(plan.requirement_completion(), 1),
+        "courses": len(plan.assigned_courses()),
+        "mtime": mtime,
+        "hash": assignments_hash(plan.to_assignments()),
+        "base": base,
+    }
+
+
+class SlotIndex:
+    """Slot names and per-slot metadata, kept in one small file.
+
+    Saving a slot updates its entry, so listing the slots and showing
+    their summaries neither scans the save directory nor opens the slot
+    files. Entries are None until their metadata is needed - after a
+    rebuild, a slot file is only read when its summary is first shown.
+    """
+
+    def __init__(self, store, course_by_code=None, rules=None):
+        self.store = store
+        self.save_dir = store.save_dir
+        self.path = os.path.join(self.save_dir, SLOT_INDEX_FILE)
+        self.course_by_code = course_by_code or {}
+        self.rules = rules
+        self.slots = {}  # Slot name -> metadata dict or None
+        self.load()
+
+    def load(self):
+        """Read the index file, rebuilding it from the save directory if needed"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = None
+
+        if not isinstance(data, dict) or data.get("version") != INDEX_FORMAT_VERSION:
+            self.rebuild()
+            return
+        self.slots = data.get("slots", {})
+
+    def rebuild(self):
+        """List the slot files once; their metadata is filled in lazily"""
+        self.slots = {}
+        try:
+            for filename in os.listdir(self.save_dir):
+                if filename.endswith(".json"):
+                    self.slots[filename[:-5]] = None  # Remove .json extension
+        except OSError as e:
+            print(f"Error getting save slots: {e}")
+        print(f"Rebuilt slot index with {len(self.slots)} slots")
+        self.save()
+
+    def names(self):
+        return sorted(self.slots)
+
+    def used_bases(self):
+        """Base plans referred to by any slot, or None if a slot could not be
+        read - its base is unknown, so no base may be deleted"""
+        if not self.fill():
+            return None
+        return {meta["base"] for meta in self.slots.values() if meta.get("base")}
+
+    def fill(self):
+        """Read the metadata of every slot not indexed yet, then save the
+        index once. Returns False if a slot file could not be read."""
+        complete = True
+        changed = False
+        for slot, meta in list(self.slots.items()):
+            if meta is None:
+                meta = self._read_metadata(slot)
+                if meta is None:
+                    complete = False
+                else:
+                    self.slots[slot] = meta
+                    changed = True
+        if changed:
+            self.save()
+        return complete
+
+    def get(self, slot):
+        """Metadata of a slot, reading the slot file only if it is not indexed yet.
+
+        Entries read here are written with the next save of the index.
+        """
+        meta = self.slots.get(slot)
+        if meta is None and slot in self.slots:
+            meta = self._read_metadata(slot)
+            if meta is not None:
+                self.slots[slot] = meta
+        return meta
+
+    def _read_metadata(self, slot):
+        try:
+            data = self.store.read_slot(slot)
+            assignments = self.store.assignments_of(data)
+            mtime = os.path.getmtime(self.store.slot_file(slot))
+        except (OSError, ValueError) as e:
+            print(f"Error reading save slot '{slot}': {e}")
+            return None
+
+        plan = Plan(rules=self.rules)
+        plan.load_assignments(assignments, self.course_by_code)
+        return slot_metadata(plan, mtime, self.store.base_of(data))
+
+    def update(self, slot, meta):
+        self.slots[slot] = meta
+
+    def rename(self, old_slot, new_slot):
+        self.slots[new_slot] = self.slots.pop(old_slot, None)
+
+    def remove(self, slot):
+        self.slots.pop(slot, None)
+
+    def snapshot(self):
+        """(path, data) of the index file, for writing it on the autosave thread"""
+        return self.path, {"version": INDEX_FORMAT_VERSION, "slots": dict(self.slots)}
+
+    def save(self):
+        """Write the index file right away"""
+        path, data = self.snapshot()
+        try:
+            atomic_write_json(path, data)
+        except OSError as e:
+            print(f"Error writing slot index: {e}")
+
+    def summary(self, slot):
+        """One-line description of a slot, e.g. "90 LP, 75% of requirements" """
+        meta = self.get(slot)
+        if not meta:
+            return ""
+        return f"{meta['total_lp']} LP, {meta['requirements_percent']:g}% of requirements"
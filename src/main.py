@@ -1,10 +1,13 @@
+import time
 from tkinter import Tk
 from calendar_app import CalendarApp
 
 def main():
+    start = time.perf_counter()
     root = Tk()
     root.title("Semester Calendar")
     app = CalendarApp(root)
+    print(f"Startup took {(time.perf_counter() - start) * 1000:.0f} ms")
     root.mainloop()
 
 if __name__ == "__main__":
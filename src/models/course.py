@@ -1,8 +1,73 @@
 import os
 import json
+import sys
 from tkinter import messagebox
 
+# Bits of the terms a course is offered in
+OFFERED_SOSE = 1
+OFFERED_WISE = 2
+OFFERED_BOTH = OFFERED_SOSE | OFFERED_WISE
+
+
+class CodeTable:
+    """Numbers repeated string values (groups, exam types, ...) so courses
+    can store and compare small integers instead of strings"""
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def code(self, value):
+        """Code of a value, adding the value if it is new"""
+        code = self.codes.get(value)
+        if code is None:
+            if isinstance(value, str):
+                value = sys.intern(value)
+            code = len(self.values)
+            self.values.append(value)
+            self.codes[value] = code
+        return code
+
+    def lookup(self, value):
+        """Code of a known value, or None"""
+        return self.codes.get(value)
+
+    def value(self, code):
+        return self.values[code]
+
+
+# Shared tables for the fields that repeat across the catalog
+SEMESTER_OFFERINGS = CodeTable()
+GROUPS = CodeTable()
+EXAM_TYPES = CodeTable()
+GRADINGS = CodeTable()
+
+_offering_masks = {}
+
+
+def offering_mask(semester):
+    """OFFERED_* bits for a semester offering such as "WiSe", "SoSe" or "WiSe/SoSe"""
+    mask = _offering_masks.get(semester)
+    if mask is None:
+        mask = 0
+        if semester:
+            if "SoSe" in semester:
+                mask |= OFFERED_SOSE
+            if "WiSe" in semester:
+                mask |= OFFERED_WISE
+        _offering_masks[semester] = mask
+    return mask
+
+
 class Course:
+    # Slots instead of a per-instance dict; the repeated string fields are
+    # stored as codes into the shared tables above
+    __slots__ = (
+        "title", "credits", "description", "module_code",
+        "group_code", "semester_code", "exam_type_code", "grading_code",
+        "offering", "assigned_semester", "favorite",
+    )
+
     def __init__(self, title, credits, description="", module_code="", group="", semester=None, exam_type=None, grading=None):
         self.title = title
         self.credits = credits
@@ -10,11 +75,44 @@ class Course:
         self.module_code = module_code
         self.group = group
         self.semester = semester  # When it's offered (SoSe, WiSe, or both)
-        self.assigned_semester = None  # Which semester frame it's assigned to
+        self.assigned_semester = None  # Which semester it's assigned to (kept in sync with the app's plan)
         self.exam_type = exam_type
         self.grading = grading
         self.favorite = False  # Initialize favorite status
 
+    @property
+    def group(self):
+        return GROUPS.value(self.group_code)
+
+    @group.setter
+    def group(self, value):
+        self.group_code = GROUPS.code(value)
+
+    @property
+    def semester(self):
+        return SEMESTER_OFFERINGS.value(self.semester_code)
+
+    @semester.setter
+    def semester(self, value):
+        self.semester_code = SEMESTER_OFFERINGS.code(value)
+        self.offering = offering_mask(value)  # OFFERED_* bits
+
+    @property
+    def exam_type(self):
+        return EXAM_TYPES.value(self.exam_type_code)
+
+    @exam_type.setter
+    def exam_type(self, value):
+        self.exam_type_code = EXAM_TYPES.code(value)
+
+    @property
+    def grading(self):
+        return GRADINGS.value(self.grading_code)
+
+    @grading.setter
+    def grading(self, value):
+        self.grading_code = GRADINGS.code(value)
+
     def __str__(self):
         return f"{self.title} ({self.credits} LP)"
 
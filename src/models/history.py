@@ -0,0 +1,85 @@
+from collections import deque
+from contextlib import contextmanager
+
+from utils.constants import UNDO_LIMIT
+
+
+class PlanHistory:
+    """Undo/redo log of a plan's assignment changes.
+
+    Every PlanEvent is recorded as a (course, old_index, new_index)
+    command. Undoing a step assigns its courses back to their old semester
+    through the plan, so the widgets follow just like for any other
+    change. Only the last `limit` steps are kept.
+    """
+
+    def __init__(self, plan, limit=UNDO_LIMIT):
+        self.plan = plan
+        self._undo = deque(maxlen=limit)  # Steps, each a list of commands
+        self._redo = []
+        self._group = None  # Step being collected by group()
+        self._replaying = False
+        plan.subscribe(self.on_plan_changed)
+
+    def on_plan_changed(self, event):
+        if self._replaying:
+            return
+        if self._group is not None:
+            self._group.append(tuple(event))
+        else:
+            self._undo.append([tuple(event)])
+        self._redo.clear()
+
+    @contextmanager
+    def group(self):
+        """Record all changes inside the block as one undo step"""
+        if self._group is not None:
+            yield
+            return
+        self._group = []
+        try:
+            yield
+        finally:
+            step, self._group = self._group, None
+            if step:
+                self._undo.append(step)
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def undo(self):
+        """Revert the last step. Returns False if there is nothing to undo."""
+        if not self._undo:
+            return False
+        step = self._undo.pop()
+        self._replay((course, new_index, old_index) for course, old_index, new_index in reversed(step))
+        self._redo.append(step)
+        return True
+
+    def redo(self):
+        """Apply the last undone step again. Returns False if there is nothing to redo."""
+        if not self._redo:
+            return False
+        step = self._redo.pop()
+        self._replay(step)
+        self._undo.append(step)
+        return True
+
+    def _replay(self, commands):
+        self._replaying = True
+        try:
+            for course, _, index in commands:
+                if index is None:
+                    self.plan.unassign(course)
+                else:
+                    self.plan.assign(course, index)
+        finally:
+            self._replaying = False
+
+    def clear(self):
+        """Forget all steps, e.g. after another slot was loaded"""
+        self._undo.clear()
+        self._redo.clear()
@@ -0,0 +1,188 @@
+from collections import namedtuple
+
+from models.semester import Semester
+from models.requirements import RequirementTracker
+from utils.constants import MAX_LP_PER_SEMESTER, NUM_SEMESTERS
+
+# Change notification sent to plan listeners. old_index / new_index are the
+# semester indices before and after the change (None = not assigned).
+PlanEvent = namedtuple("PlanEvent", ["course", "old_index", "new_index"])
+
+
+def course_identifier(course):
+    """Identifier of a course in save files - its module code, or its title if it has none"""
+    return course.module_code or course.title
+
+
+def default_semester_titles(count=NUM_SEMESTERS, start_year=2025):
+    """Titles for alternating semesters, starting with a summer semester"""
+    titles = []
+    for j in range(count):
+        year = start_year + (j // 2)
+        if j % 2 == 0:  # Even indexes (0, 2, 4) are Summer semesters
+            titles.append(f"SoSe {year}")
+        else:  # Odd indexes (1, 3, 5) are Winter semesters
+            titles.append(f"WiSe {year}/{year+1}")
+    return titles
+
+
+class Plan:
+    """Semester plan without any UI.
+
+    The plan owns the course -> semester assignments and the per-semester
+    credit totals. Widgets subscribe to it and only redraw in response to
+    the PlanEvents it sends, so plans can also be built and validated
+    without Tk. The plan never modifies the courses themselves, so many
+    plans can share one course catalog.
+    """
+
+    def __init__(self, semester_titles=None, max_lp=MAX_LP_PER_SEMESTER, rules=None):
+        if semester_titles is None:
+            semester_titles = default_semester_titles()
+        self.semesters = [Semester(title, max_lp) for title in semester_titles]
+        self._assignments = {}  # Course -> semester index
+        self._listeners = []
+        # Requirement credits are updated with every (un)assignment
+        self.requirements = RequirementTracker(rules)
+        self.rules = self.requirements.rules
+
+    def subscribe(self, listener):
+        """Call listener(event) with a PlanEvent after every change"""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, event):
+        for listener in list(self._listeners):
+            listener(event)
+
+    def semester_index(self, course):
+        """Index of the semester the course is assigned to, or None"""
+        return self._assignments.get(course)
+
+    def semester_of(self, course):
+        """Semester the course is assigned to, or None"""
+        index = self._assignments.get(course)
+        return self.semesters[index] if index is not None else None
+
+    def can_assign(self, course, index):
+        """Check if the course is offered in the term of the given semester"""
+        return self.semesters[index].accepts(course)
+
+    def assign(self, course, index):
+        """Assign a course to a semester, moving it if it is already placed.
+
+        Returns False if the course is not offered in that semester's term.
+        """
+        if not self.can_assign(course, index):
+            return False
+
+        old_index = self._assignments.get(course)
+        if old_index == index:
+            return True
+        if old_index is not None:
+            self.semesters[old_index].remove_course(course)
+        else:
+            # Moving between semesters does not change requirement credits
+            self.requirements.add(course)
+
+        self.semesters[index].add_course(course)
+        self._assignments[course] = index
+        self._notify(PlanEvent(course, old_index, index))
+        return True
+
+    def unassign(self, course):
+        """Remove a course from its semester. Returns False if it was not placed."""
+        old_index = self._assignments.pop(course, None)
+        if old_index is None:
+            return False
+
+        self.semesters[old_index].remove_course(course)
+        self.requirements.remove(course)
+        self._notify(PlanEvent(course, old_index, None))
+        return True
+
+    def clear(self):
+        """Remove all courses from all semesters"""
+        for course in list(self._assignments):
+            self.unassign(course)
+
+    def assigned_courses(self):
+        """All assigned courses, semester by semester"""
+        return [course for semester in self.semesters for course in semester.courses]
+
+    def total_credits(self):
+        return sum(semester.total_lp for semester in self.semesters)
+
+    def over_limit_semesters(self):
+        """Indices of semesters with more credits than allowed"""
+        return [i for i, semester in enumerate(self.semesters) if semester.is_over_limit()]
+
+    def requirement_progress(self):
+        """Credits per requirement and sub-requirement"""
+        return self.requirements.progress()
+
+    def requirement_credits(self):
+        """Total credits counted towards the graduation requirements"""
+        return self.requirements.total_credits()
+
+    def requirement_completion(self):
+        """Share of the required credits that is fulfilled, in percent.
+
+        Credits above a requirement's total do not make up for other
+        requirements.
+        """
+        rules = self.requirements.rules
+        if not rules.total_required:
+            return 100.0
+        progress = self.requirement_progress()
+        fulfilled = sum(min(progress[req.key], req.total) for req in rules.requirements)
+        return 100.0 * fulfilled / rules.total_required
+
+    def to_assignments(self):
+        """Semester assignments in the save file format ({"0": [codes], ...})"""
+        assignments = {}
+        for i, semester in enumerate(self.semesters):
+            assignments[str(i)] = [course_identifier(course) for course in semester.courses]
+        return assignments
+
+    def resolve_assignments(self, assignments, course_by_code):
+        """Look up the entries of the save file format ({"0": [codes], ...}).
+
+        Returns (targets, problems): the semester index per course for the
+        entries that can be assigned, and (semester index, identifier,
+        reason) tuples for the others.
+        """
+        targets = {}
+        problems = []
+        for semester_idx, identifiers in assignments.items():
+            try:
+                semester_idx = int(semester_idx)
+            except (TypeError, ValueError):
+                problems.extend((semester_idx, identifier, "unknown semester") for identifier in identifiers)
+                continue
+            if not 0 <= semester_idx < len(self.semesters):
+                problems.extend((semester_idx, identifier, "unknown semester") for identifier in identifiers)
+                continue
+            for identifier in identifiers:
+                course = course_by_code.get(identifier)
+                if course is None:
+                    problems.append((semester_idx, identifier, "unknown course"))
+                elif not self.can_assign(course, semester_idx):
+                    problems.append((semester_idx, identifier, "not offered"))
+                else:
+                    targets[course] = semester_idx
+        return targets, problems
+
+    def load_assignments(self, assignments, course_by_code):
+        """Assign courses from the save file format.
+
+        Returns a list of (semester index, identifier, reason) tuples for the
+        entries that could not be assigned.
+        """
+        targets, problems = self.resolve_assignments(assignments, course_by_code)
+        for course, semester_idx in targets.items():
+            self.assign(course, semester_idx)
+        return problems
@@ -0,0 +1,177 @@
+from array import array
+
+from models.plan import course_identifier
+
+
+class CourseIndex:
+    """Bit position of every course identifier of the catalog.
+
+    Positions follow the catalog order. Identifiers that are not in the
+    catalog (e.g. from an old save file) get new positions when they are
+    first seen, so plans containing them still round-trip.
+    """
+
+    def __init__(self, identifiers=()):
+        self.identifiers = []
+        self.positions = {}
+        for identifier in identifiers:
+            self.add(identifier)
+
+    @classmethod
+    def from_courses(cls, courses):
+        return cls(course_identifier(course) for course in courses)
+
+    def __len__(self):
+        return len(self.identifiers)
+
+    def add(self, identifier):
+        """Position of an identifier, adding it if it is new"""
+        position = self.positions.get(identifier)
+        if position is None:
+            position = len(self.identifiers)
+            self.identifiers.append(identifier)
+            self.positions[identifier] = position
+        return position
+
+    def mask(self, identifiers):
+        """Bitset of the given identifiers"""
+        bits = 0
+        for identifier in identifiers:
+            bits |= 1 << self.add(identifier)
+        return bits
+
+    def identifiers_of(self, bits):
+        """Identifiers of the set bits, in catalog order"""
+        identifiers = []
+        while bits:
+            low = bits & -bits
+            identifiers.append(self.identifiers[low.bit_length() - 1])
+            bits ^= low
+        return identifiers
+
+
+class PlanBits:
+    """Compact, immutable plan: one bitset per semester over a CourseIndex.
+
+    Python ints serve as the bitsets, so union, difference, equality and
+    hashing cost one pass over the machine words instead of a loop over
+    course lists. The order of the courses within a semester is not part
+    of the plan - two slots that list the same courses in a different
+    order are equal, and so are plans that only differ in trailing empty
+    semesters. Plans compared with each other must share an index.
+    """
+
+    __slots__ = ("index", "semesters", "_hash")
+
+    def __init__(self, index, semesters):
+        self.index = index
+        semesters = list(semesters)
+        # Trailing empty semesters do not change the plan
+        while semesters and not semesters[-1]:
+            semesters.pop()
+        self.semesters = tuple(semesters)
+        self._hash = None
+
+    @classmethod
+    def from_assignments(cls, index, assignments, semester_count=None):
+        """Plan from the save file format ({"0": [codes], ...})"""
+        if semester_count is None:
+            semester_count = max((int(i) + 1 for i in assignments), default=0)
+        semesters = [0] * semester_count
+        for semester_idx, identifiers in assignments.items():
+            semester_idx = int(semester_idx)
+            if semester_idx < semester_count:
+                semesters[semester_idx] |= index.mask(identifiers)
+        return cls(index, semesters)
+
+    @classmethod
+    def from_plan(cls, index, plan):
+        return cls.from_assignments(index, plan.to_assignments(), len(plan.semesters))
+
+    @classmethod
+    def from_packed(cls, index, packed, semester_count):
+        """Plan from a packed assignment array (see packed())"""
+        semesters = [0] * semester_count
+        for position, semester_idx in enumerate(packed):
+            if semester_idx >= 0:
+                semesters[semester_idx] |= 1 << position
+        return cls(index, semesters)
+
+    def to_assignments(self):
+        """Save file format, courses in catalog order (without trailing empty semesters)"""
+        return {str(i): self.index.identifiers_of(bits) for i, bits in enumerate(self.semesters)}
+
+    def packed(self):
+        """Semester index of every course of the index (-1 = not placed), one byte each"""
+        packed = array('b', [-1]) * len(self.index)
+        for i, bits in enumerate(self.semesters):
+            while bits:
+                low = bits & -bits
+                packed[low.bit_length() - 1] = i
+                bits ^= low
+        return packed
+
+    def courses(self):
+        """Bitset of all placed courses"""
+        bits = 0
+        for semester_bits in self.semesters:
+            bits |= semester_bits
+        return bits
+
+    def course_count(self):
+        return sum(bin(bits).count("1") for bits in self.semesters)
+
+    def semester_of(self, identifier):
+        """Index of the semester a course is placed in, or None"""
+        position = self.index.positions.get(identifier)
+        if position is None:
+            return None
+        for i, bits in enumerate(self.semesters):
+            if bits >> position & 1:
+                return i
+        return None
+
+    def _combine(self, other, op):
+        count = max(len(self.semesters), len(other.semesters))
+        mine = self.semesters + (0,) * (count - len(self.semesters))
+        theirs = other.semesters + (0,) * (count - len(other.semesters))
+        return PlanBits(self.index, (op(a, b) for a, b in zip(mine, theirs)))
+
+    def __or__(self, other):
+        return self._combine(other, lambda a, b: a | b)
+
+    def __and__(self, other):
+        return self._combine(other, lambda a, b: a & b)
+
+    def __sub__(self, other):
+        """Placements of this plan that other does not have"""
+        return self._combine(other, lambda a, b: a & ~b)
+
+    def diff(self, other):
+        """Changes from this plan to other: (added, removed, moved).
+
+        added / removed are the identifiers placed only in other / only in
+        this plan; moved lists (identifier, old index, new index) for
+        courses placed in both but in different semesters.
+        """
+        mine, theirs = self.courses(), other.courses()
+        added = self.index.identifiers_of(theirs & ~mine)
+        removed = self.index.identifiers_of(mine & ~theirs)
+        moved = []
+        changed = (self - other).courses() & theirs
+        for identifier in self.index.identifiers_of(changed):
+            moved.append((identifier, self.semester_of(identifier), other.semester_of(identifier)))
+        return added, removed, moved
+
+    def __eq__(self, other):
+        if not isinstance(other, PlanBits):
+            return NotImplemented
+        return self.semesters == other.semesters
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(self.semesters)
+        return self._hash
+
+    def __repr__(self):
+        return f"PlanBits({self.course_count()} courses in {len(self.semesters)} semesters)"
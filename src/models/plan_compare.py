@@ -0,0 +1,59 @@
+from collections import namedtuple
+
+from data.journal import Journal, apply_plan_events
+from models.plan import Plan
+from models.plan_bits import CourseIndex, PlanBits
+
+# Differences of one plan to the reference plan. added / removed are course
+# identifiers, moved holds (identifier, old index, new index) tuples;
+# bucket_delta and semester_delta are credit differences (plan - reference).
+PlanDiff = namedtuple("PlanDiff", ["slot", "added", "removed", "moved", "bucket_delta", "semester_delta"])
+
+
+def load_slot_plan(store, slot, course_by_code, rules=None, semester_titles=None):
+    """Headless Plan of a saved slot, including its journaled changes"""
+    assignments = store.load_assignments(slot)
+    events = Journal(store.journal_file(slot)).read_events(repair=False)
+    if events:
+        assignments = apply_plan_events(assignments, events)
+    plan = Plan(semester_titles, rules=rules)
+    plan.load_assignments(assignments, course_by_code)
+    return plan
+
+
+class PlanComparison:
+    """Differences between several plans and a reference plan.
+
+    Plans are added once by name. Their course placements are kept as
+    PlanBits, so diffs are bitset operations and never touch a widget.
+    """
+
+    def __init__(self, courses=()):
+        self.index = CourseIndex.from_courses(courses)
+        self.plans = {}  # Name -> Plan
+        self.bits = {}  # Name -> PlanBits
+
+    def add(self, name, plan):
+        self.plans[name] = plan
+        self.bits[name] = PlanBits.from_plan(self.index, plan)
+
+    def names(self):
+        return list(self.plans)
+
+    def diff(self, reference, slot):
+        """PlanDiff from the reference plan to another plan"""
+        added, removed, moved = self.bits[reference].diff(self.bits[slot])
+        old, new = self.plans[reference], self.plans[slot]
+        old_buckets = old.requirements.credits_per_bucket
+        new_buckets = new.requirements.credits_per_bucket
+        bucket_delta = {key: new_buckets[key] - old_buckets[key] for key in old_buckets}
+        semester_delta = [b.total_lp - a.total_lp for a, b in zip(old.semesters, new.semesters)]
+        return PlanDiff(slot, added, removed, moved, bucket_delta, semester_delta)
+
+    def diffs(self, reference):
+        """PlanDiff of every other plan against the reference, in the order they were added"""
+        return [self.diff(reference, slot) for slot in self.plans if slot != reference]
+
+    def is_identical(self, reference, slot):
+        """Same courses in the same semesters, in any order"""
+        return self.bits[reference] == self.bits[slot]
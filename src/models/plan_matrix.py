@@ -0,0 +1,169 @@
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional - only batch scoring needs it
+    np = None
+
+from models.course import OFFERED_BOTH
+from models.plan import Plan, course_identifier
+from models.requirements import default_rules
+from utils.constants import MAX_LP_PER_SEMESTER
+
+# Scores of a batch of plans; every field has one row per plan.
+# progress has one column per requirement node (PlanMatrix.node_keys).
+PlanScores = namedtuple("PlanScores", [
+    "semester_lp",          # (plans, semesters) credits per semester
+    "over_limit",           # (plans, semesters) True where a semester exceeds max_lp
+    "lp_overflow",          # (plans,) credits above max_lp, summed over semesters
+    "offering_mismatches",  # (plans,) courses placed in a term they are not offered in
+    "bucket_credits",       # (plans, buckets) credits per leaf requirement
+    "progress",             # (plans, nodes) credits per requirement, capped like the tracker
+    "requirement_credits",  # (plans,) credits counted towards the top-level requirements
+    "completion",           # (plans,) share of the required credits fulfilled, in percent
+    "total_lp",             # (plans,) credits of all placed courses
+])
+
+
+class PlanMatrix:
+    """Scores many plans at once with NumPy array operations.
+
+    The catalog is compiled into per-course credit, bucket and offering
+    arrays. A batch of plans is an integer matrix of shape
+    (plans, courses) holding each course's semester index, or -1 where a
+    course is not placed. Per-semester credits, cap violations, term
+    mismatches and requirement progress of the whole batch are computed
+    without a Python loop over plans or courses - use this instead of
+    building a Plan per candidate when scoring thousands of plans.
+    """
+
+    def __init__(self, courses, rules=None, semester_titles=None, max_lp=MAX_LP_PER_SEMESTER):
+        if np is None:
+            raise ImportError("Batch plan scoring needs NumPy (pip install numpy)")
+        self.rules = rules if rules is not None else default_rules()
+        semesters = Plan(semester_titles, max_lp, self.rules).semesters
+        self.max_lp = max_lp
+
+        # One column per save file identifier; like loading a plan, the
+        # last course with an identifier wins
+        by_identifier = {course_identifier(course): course for course in courses}
+        self.courses = list(by_identifier.values())
+        self.column = {identifier: j for j, identifier in enumerate(by_identifier)}
+
+        # Bucket column of each course; courses outside all buckets use
+        # an extra column that is dropped after summing
+        bucket_index = {node.key: i for i, node in enumerate(self.rules.buckets)}
+        no_bucket = len(self.rules.buckets)
+        self.credits = np.array([course.credits for course in self.courses], dtype=np.int32)
+        self.bucket = np.array(
+            [bucket_index.get(self.rules.bucket_for_group(course.group), no_bucket) for course in self.courses],
+            dtype=np.intp
+        )
+        # Courses without an offering fit into every semester
+        self.offering = np.array(
+            [course.offering if course.semester else OFFERED_BOTH for course in self.courses],
+            dtype=np.uint8
+        )
+        self.term = np.array([semester.term for semester in semesters], dtype=np.uint8)
+
+        # Requirement nodes, children before their parents
+        self.nodes = []
+        for req in self.rules.requirements:
+            self._add_nodes(req)
+        self.node_keys = [node.key for node in self.nodes]
+        self.bucket_keys = [node.key for node in self.rules.buckets]
+
+    def _add_nodes(self, req):
+        for sub in req.sub_requirements:
+            self._add_nodes(sub)
+        self.nodes.append(req)
+
+    @property
+    def semester_count(self):
+        return len(self.term)
+
+    def encode(self, plans):
+        """Matrix of semester indices for plans in the save file format
+        ({"0": [codes], ...}). Unknown codes are skipped."""
+        matrix = np.full((len(plans), len(self.courses)), -1, dtype=np.int8)
+        for row, assignments in enumerate(plans):
+            for semester_idx, codes in assignments.items():
+                semester_idx = int(semester_idx)
+                if semester_idx >= self.semester_count:
+                    continue
+                for code in codes:
+                    j = self.column.get(code)
+                    if j is not None:
+                        matrix[row, j] = semester_idx
+        return matrix
+
+    def encode_plan(self, plan):
+        """Matrix row of a Plan object"""
+        return self.encode([plan.to_assignments()])[0]
+
+    def score(self, matrix):
+        """PlanScores of every row of a semester index matrix"""
+        matrix = np.asarray(matrix)
+        plan_count = matrix.shape[0]
+        semester_count = self.semester_count
+        placed = matrix >= 0
+        rows = np.broadcast_to(np.arange(plan_count)[:, None], matrix.shape)[placed]
+        placed_credits = np.broadcast_to(self.credits, matrix.shape)[placed]
+
+        # Credits per (plan, semester) and per (plan, bucket), each summed in one bincount
+        semester_lp = np.bincount(
+            rows * semester_count + matrix[placed], weights=placed_credits,
+            minlength=plan_count * semester_count
+        ).reshape(plan_count, semester_count).astype(np.int32)
+        bucket_columns = len(self.bucket_keys) + 1
+        bucket_credits = np.bincount(
+            rows * bucket_columns + np.broadcast_to(self.bucket, matrix.shape)[placed], weights=placed_credits,
+            minlength=plan_count * bucket_columns
+        ).reshape(plan_count, bucket_columns)[:, :-1].astype(np.int32)
+
+        over_limit = semester_lp > self.max_lp
+        lp_overflow = np.maximum(semester_lp - self.max_lp, 0).sum(axis=1)
+
+        # A course fits if its offering shares a term bit with its semester
+        semester_terms = self.term[np.where(placed, matrix, 0)]
+        offering_mismatches = (placed & ((self.offering & semester_terms) == 0)).sum(axis=1)
+
+        # Requirement tree bottom-up: leaves take their bucket, parents the
+        # sum of their parts, both capped by max
+        bucket_column = {key: i for i, key in enumerate(self.bucket_keys)}
+        node_column = {}
+        progress = np.zeros((plan_count, len(self.nodes)), dtype=np.int32)
+        for i, node in enumerate(self.nodes):
+            if node.sub_requirements:
+                credits = progress[:, [node_column[sub.key] for sub in node.sub_requirements]].sum(axis=1)
+            else:
+                credits = bucket_credits[:, bucket_column[node.key]]
+            if node.max_credits is not None:
+                credits = np.minimum(credits, node.max_credits)
+            progress[:, i] = credits
+            node_column[node.key] = i
+
+        top = [node_column[req.key] for req in self.rules.requirements]
+        top_totals = np.array([req.total for req in self.rules.requirements], dtype=np.int32)
+        requirement_credits = progress[:, top].sum(axis=1)
+        if self.rules.total_required:
+            fulfilled = np.minimum(progress[:, top], top_totals).sum(axis=1)
+            completion = 100.0 * fulfilled / self.rules.total_required
+        else:
+            completion = np.full(plan_count, 100.0)
+
+        return PlanScores(
+            semester_lp=semester_lp,
+            over_limit=over_limit,
+            lp_overflow=lp_overflow,
+            offering_mismatches=offering_mismatches,
+            bucket_credits=bucket_credits,
+            progress=progress,
+            requirement_credits=requirement_credits,
+            completion=completion,
+            total_lp=semester_lp.sum(axis=1),
+        )
+
+    def score_plans(self, plans):
+        """PlanScores of plans in the save file format"""
+        return self.score(self.encode(plans))
@@ -0,0 +1,158 @@
+import argparse
+import json
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from data.catalog_cache import COURSE_FIELDS, load_course_catalog
+from models.course import Course
+from models.plan import course_identifier
+from models.plan_bits import CourseIndex, PlanBits
+from models.plan_matrix import PlanMatrix
+from models.requirements import default_rules
+from models.solver import PlanSolver
+from utils.constants import MAX_LP_PER_SEMESTER
+
+RESOURCES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'resources'
+)
+
+# Search statistics of one partition
+PartitionStats = namedtuple("PartitionStats", ["partition", "worker", "plans_evaluated", "nodes", "seconds"])
+
+
+def course_rows(courses):
+    """Courses as plain field tuples, cheap to send to worker processes"""
+    return [tuple(getattr(course, field) for field in COURSE_FIELDS) for course in courses]
+
+
+def partition_prefixes(courses, rules, bucket_key):
+    """Group prefixes of a bucket's courses, e.g. "4.1", "4.2a", ... for the Profilbereich"""
+    prefixes = set()
+    for course in courses:
+        if course.group and rules.bucket_for_group(course.group) == bucket_key:
+            prefixes.add(course.group.strip().split()[0])
+    return sorted(prefixes)
+
+
+def search_partition(rows, rules, semester_titles, max_lp, bucket_key, prefix, favorite_codes, pinned_codes,
+                     count, time_budget):
+    """Run the solver with one bucket limited to one group prefix (in a worker process).
+
+    rules is the caller's RequirementRules object, pickled into the worker.
+    """
+    start = time.perf_counter()
+    courses = [Course(*row) for row in rows]
+    by_identifier = {course_identifier(course): course for course in courses}
+    favorites = [by_identifier[code] for code in favorite_codes if code in by_identifier]
+    pinned = {by_identifier[code]: index for code, index in pinned_codes.items() if code in by_identifier}
+
+    solver = PlanSolver(courses, rules, semester_titles, max_lp, favorites, pinned, {bucket_key: prefix})
+    plans = solver.solve(count, time_budget)
+    stats = PartitionStats(prefix, os.getpid(), solver.plans_evaluated, solver.nodes, time.perf_counter() - start)
+    return plans, stats
+
+
+def parallel_plan_search(courses, favorites=(), pinned=None, bucket_key="Profilbereich",
+                         count=5, time_budget=5.0, max_workers=None, rules=None,
+                         semester_titles=None, max_lp=MAX_LP_PER_SEMESTER):
+    """Search plans for every choice of group prefix within a bucket in parallel.
+
+    Each prefix (e.g. each Profilbereich) is searched by its own solver in
+    a worker process with the full time budget. Returns the best `count`
+    plans over all partitions that pass verify_plans(), best first, and a
+    PartitionStats per partition. rules, semester_titles and max_lp are
+    passed on to every worker's solver.
+    """
+    rules = rules if rules is not None else default_rules()
+    prefixes = partition_prefixes(courses, rules, bucket_key)
+    rows = course_rows(courses)
+    favorite_codes = [course_identifier(course) for course in favorites]
+    pinned_codes = {course_identifier(course): index for course, index in (pinned or {}).items()}
+
+    plans = []
+    stats = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(search_partition, rows, rules, semester_titles, max_lp, bucket_key, prefix,
+                            favorite_codes, pinned_codes, count, time_budget)
+            for prefix in prefixes
+        ]
+        for future in futures:
+            partition_plans, partition_stats = future.result()
+            plans.extend(partition_plans)
+            stats.append(partition_stats)
+
+    # Merge the partitions' top plans, dropping plans found twice (in any
+    # course order)
+    index = CourseIndex.from_courses(courses)
+    merged = []
+    seen = set()
+    for plan in sorted(plans, key=lambda plan: plan.score):
+        key = PlanBits.from_assignments(index, plan.assignments)
+        if key not in seen:
+            seen.add(key)
+            merged.append(plan)
+    merged = verify_plans(merged, courses, rules, semester_titles, max_lp)
+    return merged[:count], stats
+
+
+def verify_plans(plans, courses, rules, semester_titles, max_lp):
+    """Plans that are still complete and within the LP cap when loaded back
+    from their save file format, scored as one PlanMatrix batch.
+
+    Loading maps an identifier to the last course with it, which can differ
+    from the course a worker placed. Without NumPy the plans are returned
+    unchecked.
+    """
+    if not plans:
+        return plans
+    try:
+        matrix = PlanMatrix(courses, rules, semester_titles, max_lp)
+    except ImportError:
+        return plans
+    scores = matrix.score_plans([plan.assignments for plan in plans])
+    verified = [
+        plan for plan, overflow, mismatches, completion
+        in zip(plans, scores.lp_overflow, scores.offering_mismatches, scores.completion)
+        if not overflow and not mismatches and completion >= 100
+    ]
+    if len(verified) < len(plans):
+        print(f"Dropped {len(plans) - len(verified)} plans that do not load back complete")
+    return verified
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search semester plans in parallel, one Profilbereich per worker")
+    parser.add_argument("--count", type=int, default=5, help="number of plans to return")
+    parser.add_argument("--time-budget", type=float, default=5.0, help="search time per partition in seconds")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--bucket", default="Profilbereich", help="requirement whose group choices are partitioned")
+    args = parser.parse_args()
+
+    courses, _ = load_course_catalog(
+        os.path.join(RESOURCES_DIR, 'courses.json'),
+        os.path.join(RESOURCES_DIR, 'cache', 'courses.pickle')
+    )
+    default_rules().compile_groups({course.group for course in courses})
+
+    start = time.perf_counter()
+    plans, stats = parallel_plan_search(courses, bucket_key=args.bucket, count=args.count,
+                                        time_budget=args.time_budget, max_workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    for partition in stats:
+        rate = partition.plans_evaluated / partition.seconds if partition.seconds else 0
+        print(f"{partition.partition:>6}: worker {partition.worker}, {partition.plans_evaluated} plans "
+              f"in {partition.seconds:.1f} s ({rate:.0f} plans/s, {partition.nodes} nodes)")
+    print(f"Searched {len(stats)} partitions in {elapsed:.1f} s")
+
+    for plan in plans:
+        print(json.dumps({"score": plan.score, "semester_credits": plan.semester_credits,
+                          "assignments": plan.assignments}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+import json
+import os
+
+# Requirement definitions of the degree program, next to courses.json
+REQUIREMENTS_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'resources', 'requirements.json'
+)
+
+
+class Requirement:
+    """One node of the requirement tree.
+
+    Leaf requirements collect the credits of the course groups matching
+    their group_prefixes; requirements with sub-requirements sum the
+    credits of their parts. max, if set, caps the credits that count.
+    Sub-requirements use the "<requirement>_<sub requirement>" key.
+    """
+
+    def __init__(self, name, total, key=None, max_credits=None, group_prefixes=(), color=None, sub_requirements=()):
+        self.name = name
+        self.key = key or name
+        self.total = total  # Credits needed to fulfill the requirement
+        self.max_credits = max_credits
+        self.group_prefixes = list(group_prefixes)
+        self.color = color
+        self.sub_requirements = list(sub_requirements)
+
+    @classmethod
+    def from_dict(cls, data, parent_key=None):
+        key = f"{parent_key}_{data['name']}" if parent_key else data["name"]
+        return cls(
+            name=data["name"],
+            total=data.get("total", 0),
+            key=key,
+            max_credits=data.get("max"),
+            group_prefixes=data.get("group_prefixes", []),
+            color=data.get("color"),
+            sub_requirements=[cls.from_dict(sub, key) for sub in data.get("sub_requirements", [])]
+        )
+
+    def walk(self):
+        """This requirement and all requirements below it"""
+        yield self
+        for sub in self.sub_requirements:
+            yield from sub.walk()
+
+
+class RequirementRules:
+    """Requirement tree compiled into a group -> bucket lookup table.
+
+    The buckets are the leaf requirements. Evaluating a plan is one pass
+    over its courses adding credits to their group's bucket, followed by
+    one pass over the tree.
+    """
+
+    def __init__(self, requirements, total_required, program=""):
+        self.program = program
+        self.requirements = requirements  # Top-level Requirement nodes
+        self.total_required = total_required
+
+        # Leaf requirements and their group prefixes, longest first so
+        # that e.g. "4.2" wins over "4."
+        self.buckets = [node for req in requirements for node in req.walk() if not node.sub_requirements]
+        self._bucket_nodes = {node.key: node for node in self.buckets}
+        self._prefixes = sorted(
+            ((prefix, node) for node in self.buckets for prefix in node.group_prefixes),
+            key=lambda item: len(item[0]),
+            reverse=True
+        )
+        self.group_table = {}  # Group -> bucket key (or None), filled by compile_groups
+
+    @classmethod
+    def from_dict(cls, data):
+        requirements = [Requirement.from_dict(req) for req in data["requirements"]]
+        total = data.get("total", sum(req.total for req in requirements))
+        return cls(requirements, total, data.get("program", ""))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def compile_groups(self, groups):
+        """Fill the lookup table for the given course groups in advance"""
+        for group in groups:
+            self.bucket_for_group(group)
+
+    def bucket_for_group(self, group):
+        """Key of the bucket a course group counts towards, or None"""
+        try:
+            return self.group_table[group]
+        except KeyError:
+            pass
+
+        bucket = None
+        if group:
+            stripped = group.strip()  # Remove any whitespace
+            for prefix, node in self._prefixes:
+                if stripped.startswith(prefix):
+                    bucket = node.key
+                    break
+        self.group_table[group] = bucket
+        return bucket
+
+    def color_for_group(self, group):
+        """Display color of a course group's bucket, or None"""
+        node = self._bucket_nodes.get(self.bucket_for_group(group))
+        return node.color if node else None
+
+    def empty_buckets(self):
+        return {node.key: 0 for node in self.buckets}
+
+    def progress(self, credits_per_bucket):
+        """Credits per requirement key for the given bucket credits.
+
+        Requirements with sub-requirements hold the sum of their parts;
+        every value is capped by the requirement's max, if set.
+        """
+        progress = {}
+        for req in self.requirements:
+            self._evaluate(req, credits_per_bucket, progress)
+        return progress
+
+    def _evaluate(self, req, credits_per_bucket, progress):
+        if req.sub_requirements:
+            credits = sum(self._evaluate(sub, credits_per_bucket, progress) for sub in req.sub_requirements)
+        else:
+            credits = credits_per_bucket.get(req.key, 0)
+        if req.max_credits is not None:
+            credits = min(credits, req.max_credits)
+        progress[req.key] = credits
+        return credits
+
+    def total_credits(self, progress):
+        """Total credits counted towards the top-level requirements"""
+        return sum(progress[req.key] for req in self.requirements)
+
+
+_default_rules = None
+
+
+def default_rules():
+    """Requirement rules loaded once from REQUIREMENTS_FILE"""
+    global _default_rules
+    if _default_rules is None:
+        _default_rules = RequirementRules.load(REQUIREMENTS_FILE)
+    return _default_rules
+
+
+class RequirementTracker:
+    """Running credit totals per requirement bucket.
+
+    Adding or removing a course applies its credits to its bucket, so the
+    progress of a plan is kept up to date without walking all its courses.
+    """
+
+    def __init__(self, rules=None):
+        self.rules = rules if rules is not None else default_rules()
+        self.credits_per_bucket = self.rules.empty_buckets()
+
+    def bucket_of(self, course):
+        return self.rules.bucket_for_group(getattr(course, 'group', None))
+
+    def add(self, course):
+        """Count a course's credits. Returns the affected bucket or None."""
+        bucket = self.bucket_of(course)
+        if bucket is not None:
+            self.credits_per_bucket[bucket] += course.credits
+        return bucket
+
+    def remove(self, course):
+        """Stop counting a course's credits. Returns the affected bucket or None."""
+        bucket = self.bucket_of(course)
+        if bucket is not None:
+            self.credits_per_bucket[bucket] -= course.credits
+        return bucket
+
+    def progress(self):
+        """Credits per requirement and sub-requirement key"""
+        return self.rules.progress(self.credits_per_bucket)
+
+    def total_credits(self):
+        return self.rules.total_credits(self.progress())
+
+
+def evaluate_requirements(courses, rules=None):
+    """Sum the credits of the given courses per requirement"""
+    tracker = RequirementTracker(rules)
+    for course in courses:
+        tracker.add(course)
+    return tracker.progress()
@@ -1,23 +1,52 @@
+from models.course import OFFERED_SOSE, OFFERED_WISE, offering_mask
+from utils.constants import MAX_LP_PER_SEMESTER
+
+
+def term_mask(semester_title):
+    """OFFERED_* bit of a semester from its title (e.g., "SoSe 2025" -> OFFERED_SOSE)"""
+    return OFFERED_SOSE if "SoSe" in semester_title else OFFERED_WISE
+
+
+def is_compatible_semester(course_semester, target_semester_title):
+    """Check if a course can be placed in a given semester"""
+    # If course has no semester restriction, it can go anywhere
+    if not course_semester:
+        return True
+
+    # Compatible if the course is offered in the target's term
+    # (courses offered in both terms fit everywhere, "k.A." nowhere)
+    return bool(offering_mask(course_semester) & term_mask(target_semester_title))
+
+
 class Semester:
-    def __init__(self):
+    def __init__(self, title="", max_lp=MAX_LP_PER_SEMESTER):
+        self.title = title
         self.courses = []
         self.total_lp = 0
-        self.max_lp = 30  # Maximum LP per semester
+        self.max_lp = max_lp  # Maximum LP per semester
+        self.term = term_mask(title)
 
     def add_course(self, course):
-        if self.total_lp + course.lp <= self.max_lp:
-            self.courses.append(course)
-            self.total_lp += course.lp
-            return True
-        return False
+        """Add a course - going over max_lp is allowed but reported by is_over_limit()"""
+        if course in self.courses:
+            return False
+        self.courses.append(course)
+        self.total_lp += course.credits
+        return True
 
     def remove_course(self, course):
         if course in self.courses:
             self.courses.remove(course)
-            self.total_lp -= course.lp
+            self.total_lp -= course.credits
             return True
         return False
 
+    def accepts(self, course):
+        """Check if the course is offered in this semester's term"""
+        if not getattr(course, 'semester', None):
+            return True
+        return bool(course.offering & self.term)
+
     def get_courses(self):
         return self.courses
 
@@ -27,6 +56,9 @@ class Semester:
     def is_full(self):
         return self.total_lp >= self.max_lp
 
+    def is_over_limit(self):
+        return self.total_lp > self.max_lp
+
     def clear_courses(self):
         self.courses.clear()
-        self.total_lp = 0
\ No newline at end of file
+        self.total_lp = 0
@@ -0,0 +1,376 @@
+import heapq
+import itertools
+import time
+from collections import namedtuple
+
+from models.plan import Plan, course_identifier
+from models.requirements import default_rules
+from utils.constants import MAX_LP_PER_SEMESTER
+
+# A finished plan. assignments uses the save file format ({"0": [codes], ...}),
+# placements maps every Course of the plan (pinned ones included) to its
+# semester index; a lower score is better.
+SolvedPlan = namedtuple("SolvedPlan", ["score", "assignments", "semester_credits", "favorites", "placements"])
+
+
+class _TimeUp(Exception):
+    pass
+
+
+class PlanSolver:
+    """Branch-and-bound search for complete semester plans.
+
+    The search runs in two levels. First it picks, bucket by bucket, a set
+    of courses that fulfills every leaf requirement (favorites are tried
+    first). Then it places the picked courses into the semesters they are
+    offered in without exceeding the LP cap, looking for the placement
+    with the most even load. Both levels prune branches that cannot beat
+    the worst of the best plans found so far.
+
+    Requirements with sub-requirements and the overall total can ask for
+    more credits than their leaves do; such gaps are topped up from the
+    leaves' remaining courses before a selection is placed.
+
+    Score = load variance + OVERSHOOT_PENALTY per credit above a
+    requirement's total - FAVORITE_BONUS per favorite in the plan.
+    Pinned courses keep their semester and count towards their bucket.
+    bucket_groups ({bucket key: group prefix}) restricts the courses a
+    bucket may use, e.g. to a single Profilbereich.
+    """
+
+    OVERSHOOT_PENALTY = 10
+    FAVORITE_BONUS = 5
+    # Check the time budget every this many search nodes
+    CLOCK_INTERVAL = 256
+    # Search nodes spent improving the placement of one course selection
+    PLACEMENT_NODE_LIMIT = 5000
+
+    def __init__(self, courses, rules=None, semester_titles=None, max_lp=MAX_LP_PER_SEMESTER,
+                 favorites=(), pinned=None, bucket_groups=None):
+        self.rules = rules if rules is not None else default_rules()
+        self.semesters = Plan(semester_titles, max_lp, self.rules).semesters
+        self.max_lp = max_lp
+        self.favorites = set(favorites)
+        self.pinned = dict(pinned or {})  # Course -> semester index
+        self.bucket_groups = dict(bucket_groups or {})
+
+        self.nodes = 0  # Search nodes visited
+        self.plans_evaluated = 0  # Complete course selections that were placed
+        self.timed_out = False
+
+        # Loads and bucket credits of the pinned courses
+        self.base_loads = [0] * len(self.semesters)
+        pinned_credits = self.rules.empty_buckets()
+        for course, index in self.pinned.items():
+            self.base_loads[index] += course.credits
+            bucket = self.rules.bucket_for_group(course.group)
+            if bucket is not None:
+                pinned_credits[bucket] += course.credits
+
+        # Plans are saved by module code, and loading maps a code to the last
+        # course with it - only use those courses so plans load back as found
+        by_code = {course.module_code: course for course in courses if course.module_code}
+        # A pinned course already stands for its identifier
+        pinned_identifiers = {course_identifier(course) for course in self.pinned}
+
+        # Semesters each course can be placed in
+        self.allowed = {}
+        for course in courses:
+            if course in self.pinned or course.credits <= 0:
+                continue
+            if course.module_code and by_code[course.module_code] is not course:
+                continue
+            if course_identifier(course) in pinned_identifiers:
+                continue
+            allowed = tuple(i for i, semester in enumerate(self.semesters) if semester.accepts(course))
+            if allowed:
+                self.allowed[course] = allowed
+
+        self.pinned_credits = pinned_credits
+
+        # Courses that can count towards each bucket, favorites first, then
+        # big courses so that few courses are needed
+        self.bucket_candidates = {}
+        for node in self.rules.buckets:
+            prefix = self.bucket_groups.get(node.key)
+            candidates = [
+                course for course in self.allowed
+                if self.rules.bucket_for_group(course.group) == node.key
+                and (prefix is None or course.group.strip().startswith(prefix))
+            ]
+            candidates.sort(key=self._candidate_order)
+            self.bucket_candidates[node.key] = candidates
+
+        # Credits still missing per bucket and the courses that can fill them
+        self.needs = []
+        for node in self.rules.buckets:
+            need = node.total - pinned_credits[node.key]
+            if need > 0:
+                self.needs.append((node.key, need, self.bucket_candidates[node.key]))
+        # Buckets with few choices first - they fail fastest
+        self.needs.sort(key=lambda item: len(item[2]))
+
+        # Totals above the leaf level: every requirement with sub-requirements
+        # (children before parents) and then the overall total (key None),
+        # each with the courses of the leaves below it
+        self.top_ups = []
+        for req in self.rules.requirements:
+            self._add_top_ups(req)
+        all_leaves = [node.key for node in self.rules.buckets]
+        self.top_ups.append((None, self.rules.total_required, self._pool(all_leaves)))
+        # Favorites only the top-ups can add, for the selection bound
+        needed = {course for _, _, candidates in self.needs for course in candidates}
+        self.top_up_favorites = len((self.favorites & set(self.top_ups[-1][2])) - needed)
+
+    def _candidate_order(self, course):
+        return (course not in self.favorites, -course.credits, course_identifier(course))
+
+    def _pool(self, leaf_keys):
+        pool = [course for key in leaf_keys for course in self.bucket_candidates[key]]
+        pool.sort(key=self._candidate_order)
+        return pool
+
+    def _add_top_ups(self, req):
+        if not req.sub_requirements:
+            return
+        for sub in req.sub_requirements:
+            self._add_top_ups(sub)
+        leaf_keys = [node.key for node in req.walk() if not node.sub_requirements]
+        self.top_ups.append((req.key, req.total, self._pool(leaf_keys)))
+
+    def solve(self, count=5, time_budget=5.0):
+        """Best `count` plans found within time_budget seconds, best first"""
+        self._deadline = time.monotonic() + time_budget
+        self._best = []  # Heap of (-score, tiebreak, SolvedPlan)
+        self._tiebreak = itertools.count()
+        self._count = count
+        self.timed_out = False
+
+        if max(self.base_loads, default=0) > self.max_lp:
+            return []
+        try:
+            self._select(0, [], 0, 0)
+        except _TimeUp:
+            self.timed_out = True
+
+        return [plan for _, _, plan in sorted(self._best, key=lambda item: -item[0])]
+
+    def _tick(self):
+        self.nodes += 1
+        if self.nodes % self.CLOCK_INTERVAL == 0 and time.monotonic() > self._deadline:
+            raise _TimeUp()
+
+    def _worst_score(self):
+        """Score a new plan has to beat, or None while fewer than count plans are known"""
+        if len(self._best) < self._count:
+            return None
+        return -self._best[0][0]
+
+    def _select(self, bucket_index, chosen, overshoot, favorite_count):
+        """Pick courses for the remaining buckets, then place them"""
+        if bucket_index == len(self.needs):
+            self._top_up(0, chosen, overshoot, favorite_count)
+            return
+
+        _, need, candidates = self.needs[bucket_index]
+        # Credits still available from candidate j onwards
+        suffix = [0] * (len(candidates) + 1)
+        for j in range(len(candidates) - 1, -1, -1):
+            suffix[j] = suffix[j + 1] + candidates[j].credits
+
+        remaining_favorites = self.top_up_favorites + sum(
+            1 for _, _, cands in self.needs[bucket_index:] for c in cands if c in self.favorites
+        )
+
+        def pick(start, missing, extra, bucket_favorites):
+            self._tick()
+            if missing == 0:
+                self._select(bucket_index + 1, chosen, overshoot + extra, favorite_count + bucket_favorites)
+                return
+            if suffix[start] < missing:
+                return
+
+            # The best this branch could still reach
+            worst = self._worst_score()
+            if worst is not None:
+                bound = (self.OVERSHOOT_PENALTY * (overshoot + extra)
+                         - self.FAVORITE_BONUS * (favorite_count + remaining_favorites))
+                if bound >= worst:
+                    return
+
+            for j in range(start, len(candidates)):
+                if suffix[j] < missing:
+                    break
+                course = candidates[j]
+                if course.credits > missing:
+                    continue
+                chosen.append(course)
+                pick(j + 1, missing - course.credits, extra, bucket_favorites + (course in self.favorites))
+                chosen.pop()
+
+        # Selections that hit the bucket's total exactly first, then ones
+        # with one credit more, and so on
+        for extra in range(max(course.credits for course in candidates) if candidates else 0):
+            pick(0, need + extra, extra, 0)
+
+    def _deficit(self, chosen, key, total):
+        """Credits the chosen and pinned courses still miss for a requirement
+        (key None = the overall total)"""
+        credits = dict(self.pinned_credits)
+        for course in chosen:
+            bucket = self.rules.bucket_for_group(course.group)
+            if bucket is not None:
+                credits[bucket] += course.credits
+        progress = self.rules.progress(credits)
+        if key is None:
+            return total - self.rules.total_credits(progress)
+        return total - progress[key]
+
+    def _top_up(self, index, chosen, overshoot, favorite_count):
+        """Add courses until the non-leaf requirements and the overall total
+        are met, then place the selection"""
+        if index == len(self.top_ups):
+            self._place(list(chosen), overshoot, favorite_count)
+            return
+
+        key, total, pool = self.top_ups[index]
+        missing = self._deficit(chosen, key, total)
+        if missing <= 0:
+            self._top_up(index + 1, chosen, overshoot, favorite_count)
+            return
+
+        taken = set(chosen)
+        candidates = [course for course in pool if course not in taken]
+
+        def pick(start, missing, extra, added_favorites):
+            self._tick()
+            if missing == 0:
+                # Caps (max) can keep added credits from counting - check again
+                self._top_up(index, chosen, overshoot + extra, favorite_count + added_favorites)
+                return
+            for j in range(start, len(candidates)):
+                course = candidates[j]
+                if course.credits > missing:
+                    continue
+                chosen.append(course)
+                pick(j + 1, missing - course.credits, extra, added_favorites + (course in self.favorites))
+                chosen.pop()
+
+        # Like _select: hit the missing credits exactly first, then overshoot
+        for extra in range(max((course.credits for course in candidates), default=0)):
+            pick(0, missing + extra, extra, 0)
+
+    def _place(self, courses, overshoot, favorite_count):
+        """Find the most even placement of the selected courses"""
+        self.plans_evaluated += 1
+        fixed_score = self.OVERSHOOT_PENALTY * overshoot - self.FAVORITE_BONUS * favorite_count
+
+        # Most constrained and biggest courses first
+        courses.sort(key=lambda c: (len(self.allowed[c]), -c.credits))
+        total = sum(self.base_loads) + sum(course.credits for course in courses)
+        if total > self.max_lp * len(self.semesters):
+            return
+
+        loads = list(self.base_loads)
+        placement = [None] * len(courses)
+        best = [None, None]  # Best sum of squared loads and its placement
+        worst = self._worst_score()
+        mean = total / len(loads)
+        # Variance = sum(load^2) / n - mean^2, so beating `worst` needs
+        # sum(load^2) below this limit
+        if worst is not None:
+            best[0] = (worst - fixed_score + mean * mean) * len(loads)
+
+        # Start from a greedy placement (each course into its least loaded
+        # semester), so the search below prunes from the beginning
+        greedy = self._greedy_placement(courses)
+        if greedy is not None:
+            greedy_loads, greedy_placement = greedy
+            squares = sum(load * load for load in greedy_loads)
+            if best[0] is None or squares < best[0]:
+                best[0] = squares
+                best[1] = greedy_placement
+
+        remaining = [0] * (len(courses) + 1)
+        for k in range(len(courses) - 1, -1, -1):
+            remaining[k] = remaining[k + 1] + courses[k].credits
+        budget = [self.PLACEMENT_NODE_LIMIT]
+
+        def place(k):
+            self._tick()
+            budget[0] -= 1
+            if budget[0] < 0:
+                return
+            if best[0] is not None and self._squares_bound(loads, remaining[k]) >= best[0]:
+                return
+            if k == len(courses):
+                best[0] = sum(load * load for load in loads)
+                best[1] = list(placement)
+                return
+
+            course = courses[k]
+            tried = set()
+            for index in sorted(self.allowed[course], key=loads.__getitem__):
+                # Semesters of the same term with the same load are interchangeable
+                key = (self.semesters[index].term, loads[index])
+                if key in tried or loads[index] + course.credits > self.max_lp:
+                    continue
+                tried.add(key)
+                loads[index] += course.credits
+                placement[k] = index
+                place(k + 1)
+                loads[index] -= course.credits
+
+        place(0)
+        if best[1] is None:
+            return
+
+        semester_credits = list(self.base_loads)
+        placements = dict(self.pinned)
+        placements.update(zip(courses, best[1]))
+        assignments = {str(i): [] for i in range(len(self.semesters))}
+        for course, index in placements.items():
+            assignments[str(index)].append(course_identifier(course))
+        for course, index in zip(courses, best[1]):
+            semester_credits[index] += course.credits
+
+        variance = best[0] / len(loads) - mean * mean
+        score = round(variance + fixed_score, 3)
+        plan = SolvedPlan(score, assignments, semester_credits, favorite_count, placements)
+
+        entry = (-score, next(self._tiebreak), plan)
+        if len(self._best) < self._count:
+            heapq.heappush(self._best, entry)
+        else:
+            heapq.heapreplace(self._best, entry)
+
+    def _greedy_placement(self, courses):
+        """(loads, placement) putting each course into its least loaded
+        semester, or None if a course does not fit anywhere"""
+        loads = list(self.base_loads)
+        placement = []
+        for course in courses:
+            fitting = [i for i in self.allowed[course] if loads[i] + course.credits <= self.max_lp]
+            if not fitting:
+                return None
+            index = min(fitting, key=loads.__getitem__)
+            loads[index] += course.credits
+            placement.append(index)
+        return loads, placement
+
+    @staticmethod
+    def _squares_bound(loads, credits):
+        """Smallest possible sum of squared loads after adding `credits`,
+        spreading them perfectly evenly over the lowest loads"""
+        ordered = sorted(loads)
+        level = ordered[0]
+        for i in range(len(ordered)):
+            # Raise the lowest i + 1 loads to the next load (or as far as the credits go)
+            next_load = ordered[i + 1] if i + 1 < len(ordered) else float("inf")
+            needed = (next_load - level) * (i + 1)
+            if credits <= needed:
+                level += credits / (i + 1)
+                break
+            credits -= needed
+            level = next_load
+        return sum(max(load, level) ** 2 for load in loads)
@@ -6,4 +6,31 @@ NUM_SEMESTERS = 6
 DEFAULT_COURSE_TITLE = "New Course"
 DEFAULT_COURSE_LP = 5
 DEFAULT_COURSE_EXAM_FORMAT = "Written"
-DEFAULT_COURSE_GROUP = "Group A"
\ No newline at end of file
+DEFAULT_COURSE_GROUP = "Group A"
+
+# Maximum drag ghost / hover updates per second (0 = update on every motion event)
+DRAG_FRAME_RATE = 60
+
+# How course blocks are drawn: "widgets" (a frame with labels per course)
+# or "canvas" (rectangles and text items on the list/semester canvas)
+RENDER_BACKEND = "widgets"
+
+# Delay after the last change before the current slot is saved automatically
+AUTOSAVE_DELAY_MS = 1000
+
+# Number of plan changes that can be undone
+UNDO_LIMIT = 200
+
+# Save plan changes as appends to a per-slot journal instead of rewriting
+# the slot file; the journal is folded into the slot file after this many events
+JOURNAL_MODE = False
+JOURNAL_COMPACT_EVENTS = 500
+
+# Search time (seconds) and number of alternatives for the automatic planner
+AUTO_PLAN_TIME_BUDGET = 3.0
+AUTO_PLAN_COUNT = 5
+# How often (ms) the Tk thread checks whether the automatic planner is done
+AUTO_PLAN_POLL_MS = 100
+
+# Number of recently used save slots kept parsed for fast switching
+SLOT_CACHE_SIZE = 8
@@ -0,0 +1,137 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+from data.catalog_cache import load_course_catalog
+from data.journal import Journal, apply_plan_events
+from data.plan_store import PlanStore
+from models.plan import Plan, course_identifier, default_semester_titles
+from models.requirements import default_rules
+
+RESOURCES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resources')
+
+# Issue type for each reason Plan.load_assignments reports
+LOAD_PROBLEM_TYPES = {
+    "unknown course": "unknown_code",
+    "not offered": "offering_mismatch",
+    "unknown semester": "unknown_semester",
+}
+
+
+def iter_slot_files(save_dir):
+    """Names of the slot files in save_dir, listed lazily"""
+    with os.scandir(save_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith(".json") and entry.is_file():
+                yield entry.name[:-5]  # Remove .json extension
+
+
+def plan_issues(plan, problems, courses_by_code):
+    """Issues of a loaded plan, as dicts with a "type" key.
+
+    problems are the entries load_assignments could not assign.
+    """
+    issues = []
+    for semester_idx, code, reason in problems:
+        issue = {"type": LOAD_PROBLEM_TYPES.get(reason, reason), "semester": semester_idx, "code": code}
+        if reason == "not offered":
+            course = courses_by_code[code]
+            issue["semester_title"] = plan.semesters[semester_idx].title
+            issue["offered"] = course.semester
+        issues.append(issue)
+
+    for index in plan.over_limit_semesters():
+        semester = plan.semesters[index]
+        issues.append({"type": "lp_overflow", "semester": index, "semester_title": semester.title,
+                       "lp": semester.total_lp, "max_lp": semester.max_lp})
+
+    progress = plan.requirement_progress()
+    for req in plan.rules.requirements:
+        for node in req.walk():
+            if progress[node.key] < node.total:
+                issues.append({"type": "requirement_gap", "requirement": node.key,
+                               "lp": progress[node.key], "required": node.total,
+                               "missing": node.total - progress[node.key]})
+
+    # The overall total can ask for more than the requirements add up to
+    credits = plan.requirement_credits()
+    if credits < plan.rules.total_required:
+        issues.append({"type": "total_gap", "lp": credits, "required": plan.rules.total_required,
+                       "missing": plan.rules.total_required - credits})
+    return issues
+
+
+def validate_slot(store, slot, courses_by_code, rules, semester_titles):
+    """Validation result of one slot file, ready to be written as a JSON line.
+
+    A file that cannot be read or does not have the slot file layout gives
+    a result with "valid": false and an "error" instead of issues.
+    """
+    result = {"slot": slot, "file": store.slot_file(slot)}
+    try:
+        assignments = store.load_assignments(slot)
+        # Include the changes journaled since the file was written, as the app does
+        events = Journal(store.journal_file(slot)).read_events(repair=False)
+        if events:
+            assignments = apply_plan_events(assignments, events)
+            result["journal_events"] = len(events)
+
+        plan = Plan(semester_titles, rules=rules)
+        problems = plan.load_assignments(assignments, courses_by_code)
+        issues = plan_issues(plan, problems, courses_by_code)
+    except (OSError, ValueError, KeyError, AttributeError, TypeError) as e:
+        result["valid"] = False
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+
+    result["valid"] = not issues
+    result["total_lp"] = plan.total_credits()
+    result["semester_lp"] = [semester.total_lp for semester in plan.semesters]
+    result["issues"] = issues
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate a directory of saved semester plans")
+    parser.add_argument("save_dir", nargs="?", default=os.path.join(RESOURCES_DIR, 'saves'),
+                        help="directory with the slot files (default: resources/saves)")
+    parser.add_argument("--courses", default=os.path.join(RESOURCES_DIR, 'courses.json'),
+                        help="course catalog to validate against")
+    # Not the app's cache - a catalog given with --courses would replace it
+    parser.add_argument("--cache", default=os.path.join(RESOURCES_DIR, 'cache', 'validate_courses.pickle'),
+                        help="compiled catalog cache of this tool (default: resources/cache/validate_courses.pickle)")
+    parser.add_argument("--invalid-only", action="store_true", help="only print plans with issues")
+    args = parser.parse_args()
+
+    # Load the catalog once for all plans
+    start = time.perf_counter()
+    courses, _ = load_course_catalog(args.courses, args.cache)
+    rules = default_rules()
+    rules.compile_groups({course.group for course in courses})
+    # Courses by the identifier they are saved under; like the app, the
+    # last course wins if identifiers repeat
+    courses_by_code = {course_identifier(course): course for course in courses}
+    semester_titles = default_semester_titles()
+
+    # Plans are read, checked and written one at a time
+    store = PlanStore(args.save_dir, None)
+    checked = invalid = 0
+    for slot in iter_slot_files(args.save_dir):
+        result = validate_slot(store, slot, courses_by_code, rules, semester_titles)
+        checked += 1
+        if not result["valid"]:
+            invalid += 1
+        if result["valid"] and args.invalid_only:
+            continue
+        sys.stdout.write(json.dumps(result, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+
+    elapsed = time.perf_counter() - start
+    print(f"Validated {checked} plans in {elapsed:.2f} s, {invalid} with issues", file=sys.stderr)
+    return 1 if invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())